@@ -0,0 +1,26 @@
+import os
+import json
+
+from common import measure, result
+
+# characters printed per run_python call
+STDOUT_SIZES = (0, 1_000, 100_000, 1_000_000)
+QUICK_STDOUT_SIZES = (0, 1_000, 100_000)
+
+def run(quick=False):
+    # imports the app module without opening a window (webview is imported in full_setup only)
+    import roon.__main__ as app
+
+    app.base_dir = os.getcwd()
+    api = app.Api()
+    rows = []
+    for size in QUICK_STDOUT_SIZES if quick else STDOUT_SIZES:
+        lines = max(size // 100, 1) if size else 0
+        code = f"for _ in range({lines}):\n    print('x' * 99)\nresult = {{'lines': {lines}}}\n"
+
+        def round_trip():
+            # pywebview serializes the returned dict to JSON for the page
+            json.dumps(api.run_python(code))
+        rows.append(result("bridge.run_python", measure(round_trip, repeat=5, number=5 if size < 100_000 else 1),
+                           stdout_bytes=lines * 100))
+    return rows
@@ -0,0 +1,48 @@
+import os
+import glob
+import importlib.util
+
+import roon
+import roon.allpy2json as allpy2json
+import roon.ast2json as ast2json
+import roon.builtin2json as builtin2json
+
+from common import Skipped, measure, result
+
+NODES_DIR = os.path.join(os.path.dirname(roon.__file__), "static", "nodes")
+
+def node_files():
+    return sorted(path for path in glob.glob(os.path.join(NODES_DIR, "*.py")) if not path.endswith("__init__.py"))
+
+def bench_numpy(repeat):
+    if importlib.util.find_spec("numpy") is None:
+        raise Skipped("numpy is not installed")
+    import numpy  # noqa: F401  (import cost is not part of the measurement)
+    timing = measure(lambda: builtin2json.analyze_installed_module_functions("numpy", None, use_cache=False), repeat)
+    return result("catalog.builtin2json", timing, module="numpy", cache=False)
+
+def run(quick=False):
+    repeat = 3 if quick else 5
+    rows = []
+    try:
+        rows.append(bench_numpy(repeat))
+    except Skipped as e:
+        rows.append({"name": "catalog.builtin2json", "params": {"module": "numpy"}, "skipped": str(e)})
+
+    for path in node_files():
+        name = os.path.basename(path)
+        rows.append(result("catalog.ast2json", measure(lambda: ast2json.analyze_file(path, None), repeat), file=name))
+        try:
+            allpy2json.analyze_module_functions(path, None, use_cache=False)
+        except ImportError as e:
+            # importing the module needs its dependencies (uproot, matplotlib, ...)
+            rows.append({"name": "catalog.allpy2json", "params": {"file": name}, "skipped": str(e)})
+            continue
+        rows.append(result("catalog.allpy2json",
+                           measure(lambda: allpy2json.analyze_module_functions(path, None, use_cache=False), repeat),
+                           file=name, cache=False))
+        allpy2json.analyze_module_functions(path, None, use_cache=True)
+        rows.append(result("catalog.allpy2json",
+                           measure(lambda: allpy2json.analyze_module_functions(path, None, use_cache=True), repeat),
+                           file=name, cache=True))
+    return rows
@@ -0,0 +1,57 @@
+import random
+
+import roon.engine as engine
+
+from common import measure, result
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+QUICK_SIZES = (10, 100, 1_000)
+
+def synthetic_graph(size, fan_in=2, seed=0):
+    """
+    Random DAG of size nodes in the editor's JSON format.
+
+    Every node adds up to fan_in earlier nodes (a literal fills the unused
+    inputs), so the graph has long chains as well as independent branches.
+    """
+    rng = random.Random(seed)
+    inputs = [{"name": f"x{index}", "type": "float", "default": 1.0, "kind": "POSITIONAL_OR_KEYWORD"}
+              for index in range(fan_in)]
+    source = f"def add({', '.join(spec['name'] for spec in inputs)}):\n    return {' + '.join(spec['name'] for spec in inputs)}"
+    nodes = []
+    connections = []
+    for node_id in range(size):
+        nodes.append({
+            "id": node_id,
+            "name": "add",
+            "module": "<source>",
+            "source": source,
+            "inputs": [dict(spec) for spec in inputs],
+            "outputs": [{"name": "return_value", "type": "float"}],
+            "position": {"x": node_id, "y": 0},
+        })
+        if node_id == 0:
+            continue
+        for spec in inputs:
+            if rng.random() < 0.7:
+                connections.append({
+                    "from": {"node": rng.randrange(max(0, node_id - 50), node_id), "output": "return_value"},
+                    "to": {"node": node_id, "input": spec["name"]},
+                })
+    return {"nodes": nodes, "connections": connections}
+
+def run(quick=False):
+    rows = []
+    for size in QUICK_SIZES if quick else SIZES:
+        graph = synthetic_graph(size)
+        repeat = 5 if size <= 10_000 else 3
+        rows.append(result("engine.generate_python_script", measure(lambda: engine.generate_python_script(graph), repeat),
+                           nodes=size, connections=len(graph["connections"])))
+        rows.append(result("engine.compile_plan", measure(lambda: engine.compile_plan(graph), repeat),
+                           nodes=size))
+        plan = engine.compile_plan(graph)
+        rows.append(result("engine.plan_run", measure(plan.run, repeat), nodes=size))
+        cache = engine.ResultCache()
+        plan.run(cache=cache)
+        rows.append(result("engine.plan_run_cached", measure(lambda: plan.run(cache=cache), repeat), nodes=size))
+    return rows
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from common import Skipped, measure, result
+
+ENTRIES = 2_000_000
+QUICK_ENTRIES = 200_000
+
+def write_root_file(path, entries, seed=0):
+    """Local ROOT file with a flat float branch "x" and, if awkward is available, a jagged branch "tracks"."""
+    import numpy as np
+    import uproot
+
+    rng = np.random.default_rng(seed)
+    branches = {"x": rng.normal(size=entries)}
+    try:
+        import awkward as ak
+        counts = rng.poisson(5, size=entries)
+        branches["tracks"] = ak.unflatten(rng.exponential(size=int(counts.sum())), counts)
+    except ImportError:
+        pass
+    with uproot.recreate(path) as f:
+        f["events"] = branches
+    return list(branches)
+
+def run(quick=False):
+    try:
+        import uproot
+        import roon.builtin_uproot as nodes
+    except ImportError as e:
+        raise Skipped(f"uproot nodes unavailable: {e}")
+
+    entries = QUICK_ENTRIES if quick else ENTRIES
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.root")
+        branch_names = write_root_file(path, entries)
+        size = os.path.getsize(path)
+        # not through the file pool: its array cache would make every round after the first a cache hit
+        root_file = uproot.open(path, array_cache=None)
+
+        for branch in branch_names:
+            timing = measure(lambda: nodes.read_tree_branch(root_file, "events", branch), repeat=3)
+            rows.append(result("uproot.read_tree_branch", timing, {"events_per_second": entries / timing["best"]},
+                               branch=branch, entries=entries))
+            timing = measure(lambda: nodes.branch_stats(root_file, "events", branch), repeat=3)
+            rows.append(result("uproot.branch_stats", timing, {"events_per_second": entries / timing["best"]},
+                               branch=branch, entries=entries))
+            timing = measure(lambda: nodes.fill_histogram(root_file, "events", branch, 100, -5.0, 5.0), repeat=3)
+            rows.append(result("uproot.fill_histogram", timing, {"events_per_second": entries / timing["best"]},
+                               branch=branch, entries=entries))
+
+        timing = measure(lambda: nodes.process_dataset([path], "events", branch_names, range=(-5.0, 5.0),
+                                                       max_workers=1), repeat=3)
+        rows.append(result("uproot.process_dataset", timing, {"mb_per_second": size / 1e6 / timing["best"]},
+                           branches=branch_names, entries=entries))
+        root_file.close()
+    return rows
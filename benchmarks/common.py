@@ -0,0 +1,51 @@
+import gc
+import time
+import statistics
+
+class Skipped(Exception):
+    """Raised by a benchmark whose optional dependencies are missing."""
+
+def measure(func, repeat=5, number=1, setup=None):
+    """
+    Time func over repeat rounds of number calls each.
+
+    setup (if given) runs before every round and is not timed. The garbage
+    collector is disabled while timing, as timeit does.
+
+    Returns:
+        dict: {"best", "median", "mean", "repeat", "number"} with per-call seconds
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return {
+        "best": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "repeat": repeat,
+        "number": number,
+    }
+
+def result(name, timing, metrics=None, **params):
+    """
+    One benchmark result row: name, parameters and the timing from measure().
+
+    params identify the benchmark across runs (compare.py matches on them);
+    derived numbers such as throughput go in metrics.
+    """
+    row = {"name": name, "params": params}
+    if metrics:
+        row["metrics"] = metrics
+    row.update(timing)
+    return row
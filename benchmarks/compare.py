@@ -0,0 +1,52 @@
+"""
+Compare two benchmark result files: python benchmarks/compare.py BASE.json NEW.json [--threshold 0.1]
+
+Exits with status 1 if any benchmark got slower by more than the threshold.
+"""
+import sys
+import json
+import argparse
+
+def keyed(report):
+    rows = {}
+    for row in report["results"]:
+        if "best" in row:
+            key = (row["name"], json.dumps(row.get("params", {}), sort_keys=True))
+            rows[key] = row
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two roon benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown of the best time reported as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base_report = json.load(f)
+    with open(args.new) as f:
+        new_report = json.load(f)
+    base = keyed(base_report)
+    new = keyed(new_report)
+
+    print(f"{base_report.get('commit')} -> {new_report.get('commit')}")
+    regressions = 0
+    for key in sorted(base.keys() & new.keys()):
+        before = base[key]["best"]
+        after = new[key]["best"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  faster"
+        params = ", ".join(f"{name}={value}" for name, value in json.loads(key[1]).items())
+        print(f"{key[0]:<34}{before * 1e3:12.3f} ms {after * 1e3:12.3f} ms {change:+8.1%}{flag}  {params}")
+    for key in sorted(new.keys() - base.keys()):
+        print(f"{key[0]:<34}{'new':>15} {new[key]['best'] * 1e3:12.3f} ms")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
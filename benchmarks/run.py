@@ -0,0 +1,90 @@
+"""
+Benchmark suite: python benchmarks/run.py [--quick] [--suite NAME ...] [--output FILE]
+
+Results are written as JSON (default: benchmarks/results/<commit>-<time>.json)
+and can be compared across commits with benchmarks/compare.py.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import traceback
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+from common import Skipped  # noqa: E402
+
+SUITES = ("engine", "catalog", "bridge", "uproot")
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+def run_suite(name, quick):
+    module = __import__(f"bench_{name}")
+    print(f"[bench] {name}", file=sys.stderr)
+    try:
+        rows = module.run(quick=quick)
+    except Skipped as e:
+        return [{"name": name, "skipped": str(e)}]
+    except Exception as e:
+        traceback.print_exc()
+        return [{"name": name, "error": f"{type(e).__name__}: {e}"}]
+    for row in rows:
+        if "best" in row:
+            params = ", ".join(f"{key}={value}" for key, value in row["params"].items())
+            if "metrics" in row:
+                params += "  (" + ", ".join(f"{key}={value:.4g}" for key, value in row["metrics"].items()) + ")"
+            print(f"  {row['name']:<34}{row['best'] * 1e3:12.3f} ms  {params}", file=sys.stderr)
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the roon benchmark suite")
+    parser.add_argument("--suite", action="append", choices=SUITES, help="run only these suites (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a fast sanity check")
+    parser.add_argument("--output", help="JSON result file (default: benchmarks/results/<commit>-<time>.json)")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    # keep the user's catalog cache out of the measurements
+    os.environ["ROON_CACHE_DIR"] = tempfile.mkdtemp(prefix="roon-bench-cache-")
+
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "quick": args.quick,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": [],
+    }
+    for name in args.suite or SUITES:
+        report["results"].extend(run_suite(name, args.quick))
+
+    output = args.output
+    if output is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(HERE, "results", f"{commit or 'unknown'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"[bench] results written to {output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
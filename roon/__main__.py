@@ -1,110 +1,380 @@
-import webview
+import time
+_process_start = time.perf_counter()
+
 import os
 import io
 import sys
+import json
+import argparse
 
-import roon.allpy2json as allpy2json
+# webview (and the GUI toolkit behind it) is imported in full_setup only, so
+# importing this module or running headless stays cheap
 import roon.engine as engine
+from roon import batch, buffers, capture, catalog, jobs, profiling, server, streaming, summary
 
-import importlib.resources as resources
-import http.server
-import socketserver
 import threading
+from contextlib import contextmanager
 
 base_dir = None
 
-# Path to your Svelte app's build folder
-svelte_build_dir = os.path.abspath("./roon/static/svelte")  # Adjust path as needed
-
-# Global server reference for clean shutdown
-httpd = None
-
-# Serve the Svelte app locally
-def start_server():
-    global httpd
-
-    """Start an HTTP server to serve Svelte static files."""
-    # Determine if running from source or installed package
-    # if "roon" in sys.modules and hasattr(sys.modules["roon"], "__file__"):
-    #     # Running from source directory
-    #     module_dir = os.path.dirname(os.path.abspath(__file__))
-    #     # svelte_build_dir = os.path.join(module_dir, "static", "svelte")
-    #     svelte_build_dir = os.path.abspath("./public/")
-    #     print("Using local build dir")
-    # else:
-    # Running from installed package
-    try:
-        with resources.path("roon.static", "svelte") as svelte_path:
-            svelte_build_dir = str(svelte_path)
-
-        if not os.path.exists(svelte_build_dir):
-            raise FileNotFoundError(f"Svelte build directory not found: {svelte_build_dir}")
-    except Exception as e:
-        print(f"Error finding Svelte build directory: {e}")
-        svelte_build_dir = os.path.abspath("./roon/static/svelte")  # Adjust path as needed
-
-    os.chdir(svelte_build_dir)
-    PORT = 8000
-    Handler = http.server.SimpleHTTPRequestHandler
-    # Custom TCPServer with SO_REUSEADDR
-    class ReuseTCPServer(socketserver.TCPServer):
-        allow_reuse_address = True  # Enable port reuse
-
-    # Start the server
-    httpd = ReuseTCPServer(("", PORT), Handler)
-
-    # Run server in a separate thread
-    server_thread = threading.Thread(target=httpd.serve_forever)
-    server_thread.daemon = True
-    server_thread.start()
-    return f"http://localhost:{PORT}"
-
 # Python functions to expose to JavaScript
 
 exec_globals = {}
 exec_locals = {}
-class Api:
-    def run_python(self, code, globals=None, locals=None):
-        old_dir = os.getcwd()
-        try:
+# node outputs from previous graph runs, reused while their inputs are unchanged
+graph_cache = engine.ResultCache()
+# background runs submitted from the UI
+job_manager = jobs.JobManager()
+# per-node measurements of the last profiled graph run (see Api.save_trace)
+last_profiler = None
+
+# Runs may overlap once they are submitted as jobs; only the first one to start
+# switches into base_dir and only the last one to finish switches back
+_cwd_lock = threading.Lock()
+_cwd_users = 0
+_cwd_previous = None
+
+@contextmanager
+def _in_base_dir():
+    global _cwd_users, _cwd_previous
+    with _cwd_lock:
+        if _cwd_users == 0:
+            _cwd_previous = os.getcwd()
             os.chdir(base_dir)
-            # Capture stdout and stderr
+        _cwd_users += 1
+    try:
+        yield
+    finally:
+        with _cwd_lock:
+            _cwd_users -= 1
+            if _cwd_users == 0:
+                os.chdir(_cwd_previous)
+
+def _bridge_value(value):
+    """
+    What run_python sends back over the JS bridge for its result.
+
+    Large arrays become a buffer handle fetched from /buffer/<handle>; values
+    the bridge cannot serialize as JSON are replaced by their summary instead
+    of being converted element by element.
+    """
+    wrapped = buffers.wrap_result(value)
+    if wrapped is not value:
+        return wrapped
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError, RecursionError):
+        return summary.summarize(value)
+    return value
+
+def _check_script_profile(profile):
+    # scripts have no node boundaries, only function hotspots can be profiled
+    if profile and profile not in ("deterministic", "cprofile", "sampling"):
+        raise ValueError(f"Unsupported profile option for scripts: {profile!r}, "
+                         "expected 'deterministic', 'cprofile' or 'sampling'")
+
+class Api:
+    # set by full_setup once the window exists, pushes job output to the UI
+    _pusher = None
+
+    def _run_captured(self, func, ring=None):
+        # Capture stdout and stderr of this thread only; with a ring the output
+        # is streamed in bounded chunks instead of being collected until the end
+        if ring is not None:
+            stdout_buffer = ring.writer("stdout")
+            stderr_buffer = ring.writer("stderr")
+        else:
             stdout_buffer = io.StringIO()
             stderr_buffer = io.StringIO()
-            sys.stdout = stdout_buffer
-            sys.stderr = stderr_buffer
 
+        def collected():
+            if ring is not None:
+                ring.close()
+                return ring.text("stdout"), ring.text("stderr")
+            return stdout_buffer.getvalue(), stderr_buffer.getvalue()
+
+        try:
+            with _in_base_dir(), capture.redirect(stdout_buffer, stderr_buffer):
+                result = func()
+
+            output, error = collected()
+            result.update({
+                "output": output,
+                "error": error
+            })
+            return result
+        except Exception as e:
+            if ring is not None:
+                ring.write("stderr", str(e))
+            output, error = collected()
+            return {
+                "result": None,
+                "output": output,
+                "error": str(e)
+            }
+        finally:
+            if ring is not None and not ring.closed:
+                # cancelled: make sure readers see the end of the stream
+                ring.close()
+
+    def run_python(self, code, globals=None, locals=None, profile=None):
+        """
+        Execute code in the shared namespace and return its `result` variable.
+
+        profile="deterministic" (cProfile) or "sampling" adds "profile": a
+        hotspot table and collapsed stacks, attributed to node ids when code
+        is a script from generate_python_script.
+        """
+        _check_script_profile(profile)
+        return self._run_python(code, globals, locals, profile)
+
+    def _run_python(self, code, globals=None, locals=None, profile=None, ring=None):
+        def run():
+            global last_profiler
             # add globals to exec_globals
             if globals:
                 exec_globals.update(globals)
             if locals:
                 exec_locals.update(locals)
             # Execute code
-            exec(code, exec_globals, exec_locals)
+            profiler = profiling.make_profiler(profile)
+            if profiler is None:
+                exec(code, exec_globals, exec_locals)
+            else:
+                compiled = compile(code, "<roon-script>", "exec")
+                profiler.start()
+                try:
+                    profiler.run_script(code, compiled, lambda: exec(compiled, exec_globals, exec_locals))
+                finally:
+                    profiler.stop()
+                last_profiler = profiler
+            result = exec_globals.get("result", exec_locals.get("result", "UNABLE to find RESULT in globals or locals"))
+            response = {
+                "result": _bridge_value(result),
+                "preview": summary.summarize(result),
+            }
+            if profiler is not None:
+                response["profile"] = profiler.report()
+            return response
+        return self._run_captured(run, ring)
 
-            # Restore stdout/stderr
-            sys.stdout = sys.__stdout__
-            sys.stderr = sys.__stderr__
+    def run_graph(self, graph_data, max_workers=1, pool="thread", profile=False):
+        """
+        Execute the graph in-process, re-running only nodes whose inputs changed.
 
-            return {
-                "result": exec_globals.get("result", exec_locals.get("result", "UNABLE to find RESULT in globals or locals")),
-                "output": stdout_buffer.getvalue(),
-                "error": stderr_buffer.getvalue()
+        With profile=True the result also holds "profile": wall/CPU time, peak
+        memory and output size per node id (see profiling.NodeProfiler).
+        profile="deterministic" or "sampling" reports function hotspots
+        inside the nodes instead (see profiling.HotspotProfiler).
+        """
+        return self._run_graph(graph_data, max_workers, pool, profile)
+
+    def _run_graph(self, graph_data, max_workers=1, pool="thread", profile=False, ring=None):
+        def run():
+            global last_profiler
+            profiler = profiling.make_profiler(profile)
+            previews = {}
+
+            def preview(node_id, value):
+                previews[str(node_id)] = summary.summarize(value)
+            # intermediates are summarized as they appear and then released;
+            # cacheable outputs stay reachable through graph_cache (see inspect_node)
+            run_info = engine.execute_graph(
+                graph_data,
+                namespace=exec_globals,
+                cache=graph_cache,
+                max_workers=max_workers,
+                pool=pool,
+                events=ring.event if ring is not None else None,
+                profiler=profiler,
+                release=True,
+                on_value=preview,
+            )
+            result = {
+                "result": None,
+                "executed": run_info["executed"],
+                "cached": run_info["cached"],
+                # bounded summaries only
+                "previews": previews,
             }
-        except Exception as e:
+            if profiler is not None:
+                last_profiler = profiler
+                result["profile"] = run_info["profile"]
+            return result
+        return self._run_captured(run, ring)
+
+    def save_trace(self, path):
+        """Write the last profiled graph run as a Chrome trace / Perfetto JSON timeline."""
+        if not isinstance(last_profiler, profiling.NodeProfiler):
+            raise RuntimeError("No profiled graph run yet; run the graph with profile=True first")
+        with _in_base_dir():
+            return os.path.abspath(last_profiler.save_trace(path))
+
+    def save_collapsed_stacks(self, path):
+        """Write the stacks of the last hotspot-profiled run for flamegraph.pl / speedscope."""
+        if not isinstance(last_profiler, profiling.HotspotProfiler):
+            raise RuntimeError("No hotspot profile yet; run with profile='deterministic' or 'sampling' first")
+        with _in_base_dir():
+            return os.path.abspath(last_profiler.save_collapsed(path))
+
+    # Non-blocking variants: return a job id right away and run on a worker thread.
+    # Output and node progress events are streamed into a bounded ring, read with
+    # job_output or pushed to window.roonStream(job_id, data) while the job runs
+
+    def _submit(self, func, *args, label=""):
+        ring = streaming.OutputRing()
+        job_id = job_manager.submit(func, *args, label=label, stream=ring, ring=ring)
+        if self._pusher is not None:
+            self._pusher.watch(job_id, ring)
+        return {"job_id": job_id}
+
+    def submit_python(self, code, globals=None, locals=None, profile=None):
+        _check_script_profile(profile)
+        return self._submit(self._run_python, code, globals, locals, profile, label="python")
+
+    def submit_graph(self, graph_data, max_workers=1, pool="thread", profile=False):
+        return self._submit(self._run_graph, graph_data, max_workers, pool, profile, label="graph")
+
+    def job_output(self, job_id, since=0, timeout=0):
+        return job_manager.output(job_id, since, timeout)
+
+    def job_status(self, job_id):
+        return job_manager.status(job_id)
+
+    def job_result(self, job_id, timeout=0):
+        return job_manager.result(job_id, timeout)
+
+    def cancel_job(self, job_id):
+        return job_manager.cancel(job_id)
+
+    def list_jobs(self):
+        return job_manager.list()
+
+    # Node catalog: search a compact index, fetch the full definition when a node is inserted
+
+    def node_index(self, modules=None, files=None):
+        with _in_base_dir():
+            return catalog.node_index(modules or [], files or [])
+
+    def search_nodes(self, query, modules=None, files=None, limit=50):
+        with _in_base_dir():
+            return catalog.search_nodes(query, modules or [], files or [], limit=limit)
+
+    def node_definition(self, source, name, kind="module"):
+        with _in_base_dir():
+            return catalog.node_definition(source, name, kind)
+
+    def build_catalog(self, sources, max_workers=None, timeout=60, static=False):
+        with _in_base_dir():
+            return catalog.build_catalog(sources, max_workers=max_workers, timeout=timeout, static=static)
+
+    # Binary access to arrays in the namespace (see roon.buffers)
+
+    def export_buffer(self, name):
+        """Handle, shape and dtype of the array bound to name in the Python namespace."""
+        value = exec_locals[name] if name in exec_locals else exec_globals[name]
+        if not buffers.is_exportable(value):
+            raise TypeError(f"'{name}' is a {type(value).__name__}, not an array with a fixed-size dtype")
+        return buffers.registry.export(value)
+
+    def release_buffer(self, handle):
+        return buffers.registry.release(handle)
+
+    # Previews: bounded summaries (shape, dtype, head/tail, optional stats) on demand
+
+    def inspect(self, name, max_items=10, stats=False):
+        """Summary of the value bound to name in the Python namespace."""
+        value = exec_locals[name] if name in exec_locals else exec_globals[name]
+        return summary.summarize(value, max_items, stats)
+
+    def inspect_node(self, node_id, max_items=10, stats=False):
+        """Summary of a node's output from the last graph run, None if it has not run."""
+        value = graph_cache.peek(node_id)
+        if value is engine._MISSING:
+            return None
+        return summary.summarize(value, max_items, stats)
+
+    def clear_graph_cache(self):
+        graph_cache.clear()
+        engine.plan_cache.clear()
+        return True
+
+# Node modules the UI loads on startup; their catalogs are built in the background
+DEFAULT_NODE_MODULES = ("roon.builtin_uproot", "roon.builtin_basic")
+
+class StartupProfile:
+    """Wall time of each startup phase, reported with --profile-startup."""
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.phases = []
+        self.background = {}
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append((phase, now - self.last))
+            self.last = now
+
+    def record_background(self, task, seconds):
+        with self._lock:
+            self.background[task] = seconds
+
+    def report(self):
+        with self._lock:
             return {
-                "result": None,
-                "output": stdout_buffer.getvalue(),
-                "error": str(e)
+                "phases": [{"phase": phase, "seconds": seconds} for phase, seconds in self.phases],
+                "total": self.last - self.start,
+                "background": dict(self.background),
             }
-        finally:
-            sys.stdout = sys.__stdout__
-            sys.stderr = sys.__stderr__
-            os.chdir(old_dir)
 
-def full_setup():
-    # Start the local server
-    url = start_server()
+    def format(self):
+        report = self.report()
+        lines = ["Startup profile:"]
+        for entry in report["phases"]:
+            lines.append(f"  {entry['phase']:<28}{entry['seconds'] * 1000:9.1f} ms")
+        lines.append(f"  {'time to interactive':<28}{report['total'] * 1000:9.1f} ms")
+        for task, seconds in report["background"].items():
+            lines.append(f"  [background] {task:<15}{seconds * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+def warm_catalogs(modules=DEFAULT_NODE_MODULES, profile=None):
+    """Build (or load) the cached catalogs of the default node modules."""
+    import roon.builtin2json as builtin2json
+    for module_name in modules:
+        start = time.perf_counter()
+        try:
+            with _in_base_dir():
+                builtin2json.analyze_installed_module_functions(module_name, None)
+        except Exception as e:
+            print(f"Could not warm node catalog for {module_name}: {e}", file=sys.stderr)
+        if profile is not None:
+            profile.record_background(f"catalog {module_name}", time.perf_counter() - start)
+
+def full_setup(port=None, profile_startup=None):
+    """
+    Start the server and the webview window.
+
+    Args:
+        port (int): Port for the local HTTP server (see server.start_server)
+        profile_startup (str): If set, report the startup phases once the page has
+                               loaded: "-" prints them, anything else is a JSON file path
+    """
+    profile = StartupProfile(_process_start)
+    profile.mark("python imports")
+
+    # Start the local server; it binds right away and keeps serving (and
+    # compressing the bundle) on its own threads while the window comes up
+    server.register_route("/buffer/", buffers.serve_buffer)
+    url = server.start_server(port)
+    profile.mark("http server")
+
+    # Warm the default node catalogs so the UI's first catalog requests hit the cache
+    threading.Thread(target=warm_catalogs, kwargs={"profile": profile}, name="roon-catalog-warm", daemon=True).start()
+
+    import webview
+    profile.mark("import webview")
 
     # Create the web view window
     api = Api()
@@ -119,6 +389,7 @@ def full_setup():
         # background_color='#00000000'
         # vibrancy=True
     )
+    profile.mark("create window")
 
       # Inject JS to set a custom flag when the page loads
     window.events.loaded += lambda: window.evaluate_js("""
@@ -126,20 +397,52 @@ def full_setup():
       console.log("PyWebView flag set");
     """)
 
+    if profile_startup:
+        def report_startup():
+            profile.mark("page loaded")
+            if profile_startup == "-":
+                print(profile.format(), file=sys.__stderr__)
+            else:
+                with open(profile_startup, "w") as f:
+                    json.dump(profile.report(), f, indent=4)
+        window.events.loaded += report_startup
+
     # Cleanup on window close
     def on_closed():
-        global httpd
-        if httpd:
-            print("Shutting down server...")
-            httpd.shutdown()
-            httpd.server_close()
-            httpd = None
+        server.stop_server()
     
     window.events.closed += on_closed
 
+    # Stream output of background jobs into the page as it is produced
+    def push_output(job_id, data):
+        window.evaluate_js(
+            f"window.roonStream && window.roonStream({json.dumps(job_id)}, {json.dumps(data, default=str)})"
+        )
+    api._pusher = streaming.Pusher(push_output)
+
     webview.start(debug=True)
 
-if __name__ == "__main__":
+def main(argv=None):
+    global base_dir
+
+    parser = argparse.ArgumentParser(prog="roon", description="Node based Python editor")
+    parser.add_argument("--port", type=int, default=None,
+                        help="port for the local HTTP server (default: $ROON_PORT or 8000, 0 = any free port)")
+    parser.add_argument("--profile-startup", nargs="?", const="-", default=None, metavar="FILE",
+                        help="report the time of each startup phase once the page has loaded; "
+                             "printed to stderr, or written as JSON to FILE")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    run_parser = commands.add_parser("run", help="execute a graph file without opening a window")
+    batch.add_arguments(run_parser)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        # headless: uses the engine directly, webview is never imported
+        return batch.run(args)
+
     print("Calling from: ", os.getcwd())
     base_dir = os.getcwd()
-    full_setup()
\ No newline at end of file
+    full_setup(port=args.port, profile_startup=args.profile_startup)
+
+if __name__ == "__main__":
+    sys.exit(main())
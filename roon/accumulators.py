@@ -0,0 +1,211 @@
+import math
+
+import numpy as np
+
+from roon import summary
+
+class RunningStats:
+    """
+    Count, mean, variance, min and max updated one chunk at a time.
+
+    Each chunk's own mean and sum of squared deviations are combined with the
+    running ones (Chan et al.), which stays accurate over many chunks unlike
+    accumulating sum(x) and sum(x**2). Two RunningStats merge the same way, so
+    per-file or per-process results can be combined without the raw data.
+    """
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Add a chunk of values (any array-like, flattened). Returns self."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if values.size == 0:
+            return self
+        mean = float(np.mean(values))
+        chunk = RunningStats()
+        chunk.count = int(values.size)
+        chunk.mean = mean
+        chunk.m2 = float(np.sum((values - mean) ** 2))
+        chunk.min = float(np.min(values))
+        chunk.max = float(np.max(values))
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fold other into self. Returns self."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def copy(self):
+        result = RunningStats()
+        for name in self.__slots__:
+            setattr(result, name, getattr(self, name))
+        return result
+
+    @property
+    def variance(self):
+        """Population variance (like np.var), NaN when empty."""
+        return self.m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count else math.nan
+
+    def to_dict(self):
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "mean": math.nan if empty else self.mean,
+            "std": self.std,
+            "min": math.nan if empty else self.min,
+            "max": math.nan if empty else self.max,
+        }
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean:.6g}, std={self.std:.6g}, min={self.min:.6g}, max={self.max:.6g})"
+
+class Histogram:
+    """
+    Histogram with fixed, uniform binning, filled one chunk at a time.
+
+    The binning is decided up front so that chunks, files and processes all
+    fill identical bins and can be merged by adding counts. Values outside
+    [low, high) go to the underflow / overflow counters; NaNs are counted
+    separately.
+    """
+    __slots__ = ("bins", "low", "high", "counts", "underflow", "overflow", "nan")
+
+    def __init__(self, bins=50, low=0.0, high=1.0):
+        if bins < 1:
+            raise ValueError(f"bins must be at least 1, got {bins}")
+        if not high > low:
+            raise ValueError(f"high must be greater than low, got [{low}, {high})")
+        self.bins = int(bins)
+        self.low = float(low)
+        self.high = float(high)
+        self.counts = np.zeros(self.bins, dtype=np.float64)
+        self.underflow = 0.0
+        self.overflow = 0.0
+        self.nan = 0.0
+
+    @property
+    def edges(self):
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    @property
+    def centers(self):
+        edges = self.edges
+        return (edges[:-1] + edges[1:]) / 2
+
+    def fill(self, values, weights=None):
+        """Add a chunk of values (flattened), optionally weighted. Returns self."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if weights is None:
+            weights = np.ones_like(values)
+        else:
+            weights = np.broadcast_to(np.asarray(weights, dtype=np.float64).reshape(-1), values.shape)
+
+        nan = np.isnan(values)
+        below = values < self.low
+        above = values >= self.high
+        inside = ~(nan | below | above)
+        self.nan += float(np.sum(weights[nan]))
+        self.underflow += float(np.sum(weights[below]))
+        self.overflow += float(np.sum(weights[above]))
+
+        # direct index computation is cheaper than np.histogram's searchsorted for uniform bins
+        index = ((values[inside] - self.low) * (self.bins / (self.high - self.low))).astype(np.intp)
+        np.minimum(index, self.bins - 1, out=index)
+        self.counts += np.bincount(index, weights=weights[inside], minlength=self.bins)
+        return self
+
+    def compatible(self, other):
+        return (self.bins, self.low, self.high) == (other.bins, other.low, other.high)
+
+    def merge(self, other):
+        """Add the counts of a histogram with the same binning. Returns self."""
+        if not self.compatible(other):
+            raise ValueError(
+                f"Cannot merge histograms with different binning: "
+                f"({self.bins}, {self.low}, {self.high}) vs ({other.bins}, {other.low}, {other.high})"
+            )
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.nan += other.nan
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def copy(self):
+        result = Histogram(self.bins, self.low, self.high)
+        result.counts = self.counts.copy()
+        result.underflow = self.underflow
+        result.overflow = self.overflow
+        result.nan = self.nan
+        return result
+
+    @property
+    def total(self):
+        """Sum of weights inside the range."""
+        return float(np.sum(self.counts))
+
+    def to_dict(self):
+        return {
+            "bins": self.bins,
+            "low": self.low,
+            "high": self.high,
+            "counts": self.counts.tolist(),
+            "underflow": self.underflow,
+            "overflow": self.overflow,
+            "nan": self.nan,
+        }
+
+    def plot(self, ax=None, **kwargs):
+        """Draw the histogram on ax (default: the current axes) like plt.hist would."""
+        if ax is None:
+            import matplotlib.pyplot as plt
+            ax = plt.gca()
+        kwargs.setdefault("histtype", "step")
+        return ax.hist(self.centers, bins=self.edges, weights=self.counts, **kwargs)
+
+    def __repr__(self):
+        return f"Histogram(bins={self.bins}, low={self.low:g}, high={self.high:g}, total={self.total:g})"
+
+@summary.register_summarizer(RunningStats)
+def _summarize_stats(value, preview, max_items, stats):
+    preview.update(value.to_dict())
+
+@summary.register_summarizer(Histogram)
+def _summarize_histogram(value, preview, max_items, stats):
+    preview.update({
+        "bins": value.bins,
+        "low": value.low,
+        "high": value.high,
+        "total": value.total,
+        "underflow": value.underflow,
+        "overflow": value.overflow,
+    })
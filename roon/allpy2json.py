@@ -2,9 +2,14 @@ import json
 import inspect
 import importlib.util
 import sys
+import os
+import hashlib
 from typing import TypedDict, get_type_hints, Tuple, Dict, get_origin, get_args
 import argparse
 
+import roon.ast2json as ast2json
+import roon.catalog as catalog
+
 def format_type(type_obj):
     """Convert type objects to clean string representations."""
     if type_obj is None or type_obj == inspect._empty:
@@ -22,21 +27,42 @@ def format_type(type_obj):
             return f"list[{format_type(args[0])}]"
     return str(type_obj).replace("<class '", "").replace("'>", "")
 
-def analyze_module_functions(module_path, output_dir="", base_path=None):
+def analyzed_module_name(module_path):
+    """sys.modules name used while analyzing the file at module_path."""
+    digest = hashlib.sha1(os.path.abspath(module_path).encode("utf-8")).hexdigest()[:12]
+    return f"module_to_analyze_{digest}"
+
+def analyze_module_functions(module_path, output_dir="", base_path=None, use_cache=True, static=False):
     """
     Analyzes all functions in a module and generates JSON representations including source code.
     
     Args:
         module_path (str): Path to the Python file containing the module
         output_dir (str): Directory where JSON files will be saved (default: current dir)
+        use_cache (bool): When returning JSON strings (output_dir=None), reuse the on-disk
+                          catalog while the file contents are unchanged (see roon.catalog)
+        static (bool): Only parse the file (roon.ast2json) instead of importing it, so
+                       module level code never runs
     
     Returns:
         dict: Mapping of function names to their JSON file paths
     """
-    # Load the module dynamically
-    spec = importlib.util.spec_from_file_location("module_to_analyze", module_path)
+    if static:
+        return ast2json.analyze_file(module_path, output_dir, base_path)
+
+    cache_key = None
+    if output_dir is None and use_cache:
+        cache_key = catalog.module_file_key(module_path, base_path)
+        cached = catalog.load(cache_key)
+        if cached is not None:
+            return cached
+
+    # Load the module dynamically, under a name unique to the file so that
+    # analyzing several modules does not replace one another in sys.modules
+    analyzed_name = analyzed_module_name(module_path)
+    spec = importlib.util.spec_from_file_location(analyzed_name, module_path)
     module = importlib.util.module_from_spec(spec)
-    sys.modules["module_to_analyze"] = module
+    sys.modules[analyzed_name] = module
     spec.loader.exec_module(module)
 
     # normalize the module path by removing the base_path if it is not None
@@ -121,6 +147,8 @@ def analyze_module_functions(module_path, output_dir="", base_path=None):
         
         result[func_name] = output_file
     
+    if cache_key is not None:
+        catalog.store(cache_key, result)
     return result
 
 # Example usage
@@ -0,0 +1,225 @@
+import os
+import ast
+import json
+import textwrap
+import argparse
+
+# typing aliases that format_type in the other *2json modules prints as builtins
+_TYPING_ALIASES = {
+    "Tuple": "tuple", "typing.Tuple": "tuple",
+    "Dict": "dict", "typing.Dict": "dict",
+    "List": "list", "typing.List": "list",
+}
+
+_PARAMETER_KINDS = ("POSITIONAL_ONLY", "POSITIONAL_OR_KEYWORD", "VAR_POSITIONAL", "KEYWORD_ONLY", "VAR_KEYWORD")
+
+def format_annotation(annotation):
+    """Render an annotation expression the way format_type renders the evaluated type."""
+    if annotation is None:
+        return "any"
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        # string annotation (forward reference)
+        try:
+            annotation = ast.parse(annotation.value, mode="eval").body
+        except SyntaxError:
+            return annotation.value
+    if isinstance(annotation, ast.Constant) and annotation.value is None:
+        return "None"
+    if isinstance(annotation, ast.Subscript):
+        origin = ast.unparse(annotation.value)
+        origin = _TYPING_ALIASES.get(origin, origin)
+        elements = annotation.slice
+        if isinstance(elements, ast.Tuple):
+            args = [format_annotation(arg) for arg in elements.elts]
+        else:
+            args = [format_annotation(elements)]
+        return f"{origin}[{', '.join(args)}]"
+    text = ast.unparse(annotation)
+    return _TYPING_ALIASES.get(text, text)
+
+def format_default(default):
+    """str() of the default value, as inspect-based analysis reports it."""
+    try:
+        return str(ast.literal_eval(default))
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        # not a literal (a name, a call, ...): report the expression itself
+        return ast.unparse(default)
+
+def function_inputs(node):
+    """Input descriptions for every parameter of a FunctionDef, in signature order."""
+    arguments = node.args
+    positional = arguments.posonlyargs + arguments.args
+    # defaults align with the last positional parameters
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+
+    params = []
+    for index, arg in enumerate(positional):
+        kind = _PARAMETER_KINDS[0] if index < len(arguments.posonlyargs) else _PARAMETER_KINDS[1]
+        params.append((arg, defaults[index], kind))
+    if arguments.vararg:
+        params.append((arguments.vararg, None, _PARAMETER_KINDS[2]))
+    for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        params.append((arg, default, _PARAMETER_KINDS[3]))
+    if arguments.kwarg:
+        params.append((arguments.kwarg, None, _PARAMETER_KINDS[4]))
+
+    return [
+        {
+            "name": arg.arg,
+            "type": format_annotation(arg.annotation),
+            "default": format_default(default) if default is not None else None,
+            "kind": kind,
+        }
+        for arg, default, kind in params
+    ]
+
+def typed_dict_fields(classes):
+    """
+    Fields of every TypedDict class defined at module level.
+
+    Args:
+        classes (dict): Class name -> ast.ClassDef for the module's top-level classes
+
+    Returns:
+        dict: Class name -> list of {"name", "type"} including inherited fields
+    """
+    def is_typed_dict(name, seen=()):
+        node = classes.get(name)
+        if node is None or name in seen:
+            return False
+        for base in node.bases:
+            base_name = ast.unparse(base)
+            if base_name in ("TypedDict", "typing.TypedDict", "typing_extensions.TypedDict"):
+                return True
+            if is_typed_dict(base_name, seen + (name,)):
+                return True
+        return False
+
+    def fields(name):
+        node = classes[name]
+        collected = []
+        for base in node.bases:
+            base_name = ast.unparse(base)
+            if base_name in classes and is_typed_dict(base_name):
+                collected.extend(fields(base_name))
+        for statement in node.body:
+            if isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+                collected.append({"name": statement.target.id, "type": format_annotation(statement.annotation)})
+        return collected
+
+    return {name: fields(name) for name in classes if is_typed_dict(name)}
+
+def analyze_source(source_code, output_dir="", module_name="<string>"):
+    """
+    Generates node JSON for the top-level functions in source code without executing it.
+
+    Only the AST is inspected, so module level code (imports, file access,
+    plotting) never runs. Annotations are reported as written in the source
+    rather than as resolved types.
+
+    Args:
+        source_code (str): String containing Python source code
+        output_dir (str): Directory where JSON files will be saved (default: current dir).
+                          If None, returns JSON strings instead.
+        module_name (str): Identifier for the source code in JSON output (default: "<string>")
+
+    Returns:
+        dict: Mapping of function names to their JSON file paths or JSON strings
+    """
+    tree = ast.parse(source_code)
+    lines = source_code.splitlines()
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    typed_dicts = typed_dict_fields(classes)
+
+    result = {}
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        # Analyze return value
+        returns = node.returns
+        return_name = ast.unparse(returns) if returns is not None else None
+        if return_name in typed_dicts:
+            outputs = list(typed_dicts[return_name])
+        else:
+            outputs = [{"name": "return_value", "type": format_annotation(returns)}]
+
+        # Extract source code including decorators
+        start_line = (min(decorator.lineno for decorator in node.decorator_list)
+                      if node.decorator_list else node.lineno)
+        func_source = textwrap.dedent('\n'.join(lines[start_line - 1:node.end_lineno])).strip()
+
+        function_json = {
+            "name": node.name,
+            "inputs": function_inputs(node),
+            "outputs": outputs,
+            "docstring": ast.get_docstring(node) or "",
+            "source": func_source,
+            "module": module_name
+        }
+
+        if output_dir is None:
+            result[node.name] = json.dumps(function_json, indent=4)
+            continue
+
+        output_file = f"{output_dir}{node.name}.json"
+        with open(output_file, 'w') as f:
+            json.dump(function_json, f, indent=4)
+        result[node.name] = output_file
+
+    return result
+
+def analyze_file(module_path, output_dir="", base_path=None):
+    """
+    Static counterpart of allpy2json.analyze_module_functions.
+
+    Args:
+        module_path (str): Path to the Python file
+        output_dir (str): Directory where JSON files will be saved, None returns JSON strings
+        base_path (str): Prefix removed from module_path in the "module" field
+
+    Returns:
+        dict: Mapping of function names to their JSON file paths or JSON strings
+    """
+    with open(module_path) as f:
+        source_code = f.read()
+    module_name = module_path.replace(base_path, '') if base_path is not None else module_path
+    return analyze_source(source_code, output_dir, module_name)
+
+def analyze_directory(directory, output_dir=None, base_path=None, recursive=True):
+    """
+    Statically analyzes every .py file below directory.
+
+    Returns:
+        dict: {"catalog": {path: {function name: JSON}}, "errors": {path: message}}
+    """
+    catalog = {}
+    errors = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for filename in sorted(files):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                catalog[path] = analyze_file(path, output_dir, base_path)
+            except (SyntaxError, UnicodeDecodeError, OSError) as e:
+                errors[path] = f"{type(e).__name__}: {e}"
+        if not recursive:
+            break
+    return {"catalog": catalog, "errors": errors}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate node defs from .py files without importing them")
+    parser.add_argument('path', help='Python file or directory to scan')
+    args = parser.parse_args()
+    if os.path.isdir(args.path):
+        scanned = analyze_directory(args.path)
+        for path, functions in scanned["catalog"].items():
+            print(f"{path}: {', '.join(functions)}")
+        for path, message in scanned["errors"].items():
+            print(f"{path}: {message}")
+    else:
+        for func_name in analyze_file(args.path, output_dir=None):
+            print(func_name)
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import time
+import pickle
+
+import roon.engine as engine
+from roon import profiling, summary
+
+# exit codes of `python -m roon run`
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+class UsageError(Exception):
+    """Bad graph file, override or output specification (exit code 2)."""
+
+def add_arguments(parser):
+    """Options of the `run` subcommand."""
+    parser.add_argument("graph", help="graph JSON saved from the editor ({'nodes': [...], 'connections': [...]})")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="run up to N independent nodes concurrently (default: 1)")
+    parser.add_argument("--pool", choices=("thread", "process"), default="thread",
+                        help="worker pool used with --jobs > 1 (default: thread)")
+    parser.add_argument("-s", "--set", dest="overrides", action="append", default=[], metavar="NODE.INPUT=VALUE",
+                        help="override a literal input; NODE is a node id or a unique node name, "
+                             "VALUE is parsed as JSON and otherwise taken as a string (repeatable)")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="write a JSON summary of every node's output to FILE ('-' for stdout)")
+    parser.add_argument("--save", dest="saves", action="append", default=[], metavar="NODE[.OUTPUT]=PATH",
+                        help="write one node output to PATH: .npy (numpy.save), .pkl/.pickle, .json, "
+                             "anything else as text (repeatable)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report node progress on stderr")
+    parser.add_argument("--profile", action="store_true",
+                        help="print wall/CPU time, peak memory and output size per node to stderr")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace / Perfetto timeline of the node executions to FILE")
+    parser.add_argument("--hotspots", choices=("cprofile", "sampling"),
+                        help="profile the functions called inside the nodes and print the hotspots "
+                             "to stderr (cprofile runs the graph sequentially)")
+    parser.add_argument("--collapsed", metavar="FILE",
+                        help="with --hotspots, write collapsed stacks for flamegraph.pl / speedscope to FILE")
+
+def load_graph(path):
+    try:
+        with open(path) as f:
+            graph = json.load(f)
+    except (OSError, ValueError) as e:
+        raise UsageError(f"Cannot read graph {path}: {e}")
+    if not isinstance(graph, dict) or "nodes" not in graph or "connections" not in graph:
+        raise UsageError(f"{path} is not a graph: expected an object with 'nodes' and 'connections'")
+    return graph
+
+def find_node(graph, key):
+    """Node whose id (as a string) or unique name is key."""
+    for node in graph["nodes"]:
+        if str(node["id"]) == key:
+            return node
+    named = [node for node in graph["nodes"] if node.get("name") == key]
+    if len(named) == 1:
+        return named[0]
+    if named:
+        ids = ", ".join(str(node["id"]) for node in named)
+        raise UsageError(f"Node name '{key}' is ambiguous (ids {ids}); use the node id")
+    raise UsageError(f"No node with id or name '{key}'")
+
+def _split_target(text, option):
+    target, sep, value = text.partition("=")
+    if not sep or not target:
+        raise UsageError(f"{option} expects TARGET=VALUE, got '{text}'")
+    return target, value
+
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def apply_overrides(graph, overrides):
+    """Copy of graph with literal inputs replaced, from NODE.INPUT=VALUE strings."""
+    graph = json.loads(json.dumps(graph))
+    for override in overrides:
+        target, value = _split_target(override, "--set")
+        node_key, sep, input_name = target.rpartition(".")
+        if not sep:
+            raise UsageError(f"--set expects NODE.INPUT=VALUE, got '{override}'")
+        node = find_node(graph, node_key)
+        for input_spec in node["inputs"]:
+            if input_spec["name"] == input_name:
+                input_spec["default"] = parse_value(value)
+                break
+        else:
+            names = ", ".join(input_spec["name"] for input_spec in node["inputs"])
+            raise UsageError(f"Node {node['id']} ({node['name']}) has no input '{input_name}' (inputs: {names})")
+    return graph
+
+def _resolve_save(graph, text):
+    target, path = _split_target(text, "--save")
+    try:
+        return find_node(graph, target)["id"], None, path
+    except UsageError:
+        node_key, sep, output_name = target.rpartition(".")
+        if not sep:
+            raise
+        node = find_node(graph, node_key)
+        if output_name not in [output["name"] for output in node["outputs"]]:
+            raise UsageError(f"Node {node['id']} ({node['name']}) has no output '{output_name}'")
+        # single-output nodes store their return value as is (see compile_plan)
+        if len(node["outputs"]) == 1:
+            return node["id"], None, path
+        return node["id"], output_name, path
+
+def save_output(value, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        import numpy as np
+        np.save(path, value)
+    elif extension in (".pkl", ".pickle"):
+        with open(path, "wb") as f:
+            pickle.dump(value, f)
+    elif extension == ".json":
+        with open(path, "w") as f:
+            json.dump(value, f, indent=4, default=lambda obj: summary.summarize(obj))
+    else:
+        with open(path, "w") as f:
+            f.write(value if isinstance(value, str) else repr(value))
+
+def _report_progress(event):
+    if event["type"] == "node_finished" and not event["cached"]:
+        print(f"[roon] node {event['node']} finished in {event['elapsed']:.3f} s", file=sys.__stderr__)
+    elif event["type"] == "node_failed":
+        print(f"[roon] node {event['node']} failed: {event['error']}", file=sys.__stderr__)
+
+def run(args):
+    """
+    Execute a graph file headless (the `run` subcommand).
+
+    Returns:
+        int: EXIT_OK, EXIT_FAILED when a node raised, EXIT_USAGE for bad arguments
+    """
+    try:
+        graph = apply_overrides(load_graph(args.graph), args.overrides)
+        saves = [_resolve_save(graph, text) for text in args.saves]
+        if args.jobs < 1:
+            raise UsageError("--jobs must be at least 1")
+        if args.hotspots and (args.profile or args.trace):
+            raise UsageError("--hotspots cannot be combined with --profile or --trace")
+        if args.collapsed and not args.hotspots:
+            raise UsageError("--collapsed requires --hotspots")
+        # source-defined nodes share one namespace, as in the editor
+        plan = engine.compile_plan(graph, {"__name__": "__roon_batch__"})
+    except UsageError as e:
+        print(f"roon run: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except Exception as e:
+        # unknown modules/functions, cycles, missing required inputs
+        print(f"roon run: cannot compile {args.graph}: {type(e).__name__}: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    profiler = profiling.make_profiler(args.hotspots or args.profile or bool(args.trace))
+    previews = {}
+
+    def preview(node_id, value):
+        previews[str(node_id)] = summary.summarize(value)
+    start = time.perf_counter()
+    try:
+        # intermediates are freed after their last use; only --save targets are kept to the end
+        run_info = plan.run(max_workers=args.jobs, pool=args.pool, events=None if args.quiet else _report_progress,
+                            profiler=profiler, release=True, pinned={node_id for node_id, _, _ in saves},
+                            on_value=preview if args.output else None)
+    except Exception as e:
+        print(f"roon run: {type(e).__name__}: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    finally:
+        # also for failed runs: the timeline shows where it went wrong
+        if profiler is not None and args.trace:
+            profiler.save_trace(args.trace)
+        if profiler is not None and args.collapsed:
+            profiler.save_collapsed(args.collapsed)
+    if not args.quiet:
+        print(f"[roon] {len(run_info['executed'])} nodes in {time.perf_counter() - start:.3f} s", file=sys.__stderr__)
+    if args.profile or args.hotspots:
+        print(profiler.format(), file=sys.__stderr__)
+
+    results = run_info["results"]
+    try:
+        for node_id, output_name, path in saves:
+            value = results[node_id]
+            save_output(value if output_name is None else value[output_name], path)
+        if args.output:
+            if args.output == "-":
+                json.dump(previews, sys.stdout, indent=4)
+                sys.stdout.write("\n")
+            else:
+                with open(args.output, "w") as f:
+                    json.dump(previews, f, indent=4)
+    except (OSError, TypeError, ValueError, KeyError) as e:
+        print(f"roon run: cannot write outputs: {type(e).__name__}: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    return EXIT_OK
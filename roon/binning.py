@@ -0,0 +1,186 @@
+import math
+
+import numpy as np
+
+# values looked at to decide integer-ness and to estimate distinct counts
+DEFAULT_SAMPLE_SIZE = 100_000
+MAX_BINS = 500
+
+def sample(values, size=DEFAULT_SAMPLE_SIZE, seed=0):
+    """
+    Uniform random sample (with replacement) of at most size values.
+
+    Gathering size random elements costs O(size) regardless of len(values),
+    so estimates below stay cheap for tens of millions of entries.
+    """
+    values = np.asarray(values).reshape(-1)
+    if values.size <= size:
+        return values
+    rng = np.random.default_rng(seed)
+    return values[rng.integers(0, values.size, size)]
+
+def is_integer_valued(values, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    True if values holds integers (by dtype, or floats that are all whole numbers).
+
+    For float arrays only a sample is checked; a dataset whose sampled values
+    are all whole numbers is treated as integer data.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "biu":
+        return True
+    if values.dtype.kind != "f":
+        return False
+    checked = sample(values, sample_size)
+    checked = checked[np.isfinite(checked)]
+    return bool(checked.size) and bool(np.all(checked == np.floor(checked)))
+
+def approx_distinct(values, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+    """
+    Estimated number of distinct values from a sample (GEE estimator).
+
+    Values seen once in the sample are scaled up by sqrt(n / r), values seen
+    more often are counted once; exact when the sample is the whole array.
+    """
+    values = np.asarray(values).reshape(-1)
+    n = values.size
+    if n == 0:
+        return 0
+    checked = sample(values, sample_size, seed)
+    r = checked.size
+    _, counts = np.unique(checked, return_counts=True)
+    if r == n:
+        return int(counts.size)
+    singletons = int(np.sum(counts == 1))
+    repeated = int(counts.size - singletons)
+    return int(round(math.sqrt(n / r) * singletons + repeated))
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream from a fixed-size reservoir sample.
+
+    Values are added chunk by chunk; the reservoir holds a uniform sample of
+    everything seen so far (Algorithm R), so memory is bounded by capacity
+    and quantile errors shrink like 1/sqrt(capacity). Count, min and max are
+    exact. Sketches of separate chunks or files can be merged.
+    """
+    def __init__(self, capacity=10_000, seed=0):
+        self.capacity = capacity
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.reservoir = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add a chunk of values (flattened, NaNs ignored). Returns self."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+
+        # fill the reservoir first
+        free = self.capacity - self.reservoir.size
+        if free > 0:
+            self.reservoir = np.concatenate([self.reservoir, values[:free]])
+            self.count += min(free, values.size)
+            values = values[free:]
+        if values.size:
+            # item with stream index t replaces a random slot with probability capacity / (t + 1)
+            index = np.arange(self.count, self.count + values.size)
+            slots = (self._rng.random(values.size) * (index + 1)).astype(np.int64)
+            keep = slots < self.capacity
+            self.reservoir[slots[keep]] = values[keep]
+            self.count += values.size
+        return self
+
+    def merge(self, other):
+        """Combine with a sketch of other data, keeping each side in proportion to its count."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.min, self.max = other.count, other.min, other.max
+            self.reservoir = other.reservoir.copy()
+            return self
+        total = self.count + other.count
+        size = min(self.capacity, self.reservoir.size + other.reservoir.size)
+        take = min(other.reservoir.size, int(round(size * other.count / total)))
+        keep = min(self.reservoir.size, size - take)
+        self.reservoir = np.concatenate([
+            self._rng.choice(self.reservoir, keep, replace=False),
+            self._rng.choice(other.reservoir, take, replace=False),
+        ])
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile(s), q in [0, 1]."""
+        if self.count == 0:
+            return math.nan
+        return np.quantile(self.reservoir, q)
+
+def sturges(n):
+    """Sturges' rule: log2(n) + 1 bins, good for small, roughly normal samples."""
+    return max(1, int(math.ceil(math.log2(n))) + 1) if n > 0 else 1
+
+def freedman_diaconis(n, q25, q75, low, high):
+    """
+    Freedman–Diaconis rule: bin width 2 * IQR / n^(1/3).
+
+    Returns:
+        int: Number of bins covering [low, high], or 0 if the IQR is zero
+    """
+    iqr = q75 - q25
+    if n <= 0 or iqr <= 0 or high <= low:
+        return 0
+    width = 2.0 * iqr / n ** (1.0 / 3.0)
+    return int(math.ceil((high - low) / width))
+
+def choose_binning(values, rule="auto", max_bins=MAX_BINS, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Number of bins and range for histogramming values, without sorting the data.
+
+    Integer data gets one bin per value, centred on the integers, as long as
+    that is at most max_bins. Otherwise the rule decides: "fd"
+    (Freedman–Diaconis from sketched quartiles), "sturges", or "auto" (fd,
+    falling back to sturges when the IQR is zero).
+
+    Args:
+        values: Array-like of numbers (flattened)
+        rule (str): "auto", "fd" or "sturges"
+        max_bins (int): Upper bound on the number of bins
+        sample_size (int): Values looked at for integer detection and quantiles
+
+    Returns:
+        tuple: (bins, low, high)
+    """
+    if rule not in ("auto", "fd", "sturges"):
+        raise ValueError(f"Unknown binning rule {rule!r}, expected 'auto', 'fd' or 'sturges'")
+    values = np.asarray(values).reshape(-1)
+    if values.dtype.kind == "f":
+        values = values[np.isfinite(values)]
+    n = values.size
+    if n == 0:
+        return 1, 0.0, 1.0
+    low = float(np.min(values))
+    high = float(np.max(values))
+    if low == high:
+        return 1, low - 0.5, high + 0.5
+
+    if is_integer_valued(values, sample_size):
+        span = int(high) - int(low) + 1
+        if span <= max_bins:
+            return span, low - 0.5, high + 0.5
+
+    bins = 0
+    if rule in ("auto", "fd"):
+        sketch = QuantileSketch(capacity=min(sample_size, n)).update(sample(values, sample_size))
+        q25, q75 = sketch.quantile([0.25, 0.75])
+        bins = freedman_diaconis(n, float(q25), float(q75), low, high)
+    if bins == 0:
+        bins = sturges(n)
+    return max(1, min(bins, max_bins)), low, high
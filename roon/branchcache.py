@@ -0,0 +1,377 @@
+import os
+import re
+import sys
+import json
+import struct
+import hashlib
+import threading
+
+import numpy as np
+
+from roon import catalog
+
+# bump when the layout of cached entries changes
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+_SIZE_UNITS = {
+    "b": 1, "kb": 1000, "mb": 1000 ** 2, "gb": 1000 ** 3, "tb": 1000 ** 4,
+    "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3, "tib": 1024 ** 4,
+}
+
+# .npy v1.0 header reserved up front so the shape can be filled in after streaming
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_HEADER_BYTES = 128
+
+class BranchCache:
+    """
+    Opt-in local copy of decompressed ROOT branches as .npy files.
+
+    Entries are keyed by file path, mtime, size, tree and branch, so an edited
+    or replaced file never serves stale data. Cached branches are opened with
+    np.load(mmap_mode="r"): a hit costs a page-cache read instead of basket
+    decompression, and only the parts actually touched are paged in. Jagged
+    branches are stored as their flattened content plus per-entry counts.
+
+    The directory is bounded by max_bytes; least recently used entries are
+    removed first. Disabled unless ROON_BRANCH_CACHE=1 or configure(enabled=True).
+    """
+    def __init__(self, directory=None, max_bytes=None, enabled=None):
+        self.directory = directory
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(os.environ.get("ROON_BRANCH_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.enabled = enabled if enabled is not None else os.environ.get("ROON_BRANCH_CACHE") == "1"
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_mapped = 0
+        self.bytes_written = 0
+
+    def configure(self, enabled=None, max_bytes=None, directory=None):
+        if enabled is not None:
+            self.enabled = enabled
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if directory is not None:
+            self.directory = directory
+        self._evict()
+
+    def cache_dir(self):
+        if self.directory:
+            return self.directory
+        return os.environ.get("ROON_BRANCH_CACHE_DIR") or os.path.join(os.path.dirname(catalog.cache_dir()), "branches")
+
+    def key(self, root_file, tree_name, branch_name):
+        """Entry name for a branch of an open file, or None if the file is not on local disk."""
+        path = getattr(root_file, "file_path", None)
+        if not path or not os.path.isfile(path):
+            return None
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        payload = json.dumps([path, stat.st_mtime_ns, stat.st_size, tree_name, branch_name, CACHE_FORMAT])
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+        return f"{re.sub(r'[^A-Za-z0-9_.-]', '_', branch_name)[:60]}-{digest}"
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir(), key)
+        return base + ".npy", base + ".counts.npy"
+
+    def load(self, key):
+        """
+        Memory-mapped (content, counts) for key; counts is None for flat branches.
+
+        Returns:
+            tuple: (content, counts), or None on a miss
+        """
+        content_path, counts_path = self._paths(key)
+        try:
+            content = np.load(content_path, mmap_mode="r")
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            counts = np.load(counts_path, mmap_mode="r")
+        except FileNotFoundError:
+            counts = None
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        # mtime marks recent use for eviction (atime is often disabled)
+        try:
+            os.utime(content_path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self.bytes_mapped += content.nbytes + (counts.nbytes if counts is not None else 0)
+        return content, counts
+
+    def writer(self, key, jagged):
+        return _EntryWriter(self, key, jagged)
+
+    def _stored(self, nbytes):
+        with self._lock:
+            self.stores += 1
+            self.bytes_written += nbytes
+        self._evict()
+
+    def entries(self):
+        """(key, total bytes, last use) of every cached branch, oldest first."""
+        directory = self.cache_dir()
+        if not os.path.isdir(directory):
+            return []
+        grouped = {}
+        for name in os.listdir(directory):
+            if not name.endswith(".npy"):
+                continue
+            key = name[:-len(".counts.npy")] if name.endswith(".counts.npy") else name[:-len(".npy")]
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            size, used = grouped.get(key, (0, 0))
+            grouped[key] = (size + stat.st_size, max(used, stat.st_mtime))
+        return sorted(((key, size, used) for key, (size, used) in grouped.items()), key=lambda entry: entry[2])
+
+    def _evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"Could not evict branch cache entry {path}: {e}", file=sys.stderr)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def clear(self):
+        for key, _, _ in self.entries():
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        entries = self.entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "directory": self.cache_dir(),
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "bytes_mapped": self.bytes_mapped,
+                "bytes_written": self.bytes_written,
+            }
+
+class _NpyStream:
+    """Appends 1-d chunks to a .npy file whose length is only known at the end."""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(b"\0" * _NPY_HEADER_BYTES)
+        self.dtype = None
+        self.length = 0
+
+    def write(self, chunk):
+        chunk = np.ascontiguousarray(chunk).reshape(-1)
+        if chunk.size == 0:
+            # empty chunks (e.g. flattened jagged entries) carry no reliable dtype
+            return
+        if self.dtype is None:
+            self.dtype = chunk.dtype
+        elif chunk.dtype != self.dtype:
+            chunk = chunk.astype(self.dtype)
+        self.file.write(memoryview(chunk).cast("B"))
+        self.length += chunk.size
+
+    def finish(self):
+        dtype = self.dtype if self.dtype is not None else np.dtype(np.float64)
+        header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (self.length,)})
+        padding = _NPY_HEADER_BYTES - len(_NPY_MAGIC) - 2 - len(header) - 1
+        self.file.seek(0)
+        self.file.write(_NPY_MAGIC + struct.pack("<H", _NPY_HEADER_BYTES - len(_NPY_MAGIC) - 2)
+                        + header.encode("latin1") + b" " * padding + b"\n")
+        self.file.close()
+        return self.length * dtype.itemsize + _NPY_HEADER_BYTES
+
+    def abort(self):
+        self.file.close()
+        os.remove(self.path)
+
+class _EntryWriter:
+    """Streams one branch into the cache; the entry only appears once finish() succeeds."""
+    def __init__(self, cache, key, jagged):
+        self.cache = cache
+        self.paths = cache._paths(key)
+        os.makedirs(os.path.dirname(self.paths[0]), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        self.content = _NpyStream(self.paths[0] + suffix)
+        self.counts = _NpyStream(self.paths[1] + suffix) if jagged else None
+
+    def write(self, content, counts=None):
+        self.content.write(content)
+        if self.counts is not None:
+            self.counts.write(np.asarray(counts, dtype=np.int64))
+
+    def finish(self):
+        nbytes = 0
+        if self.counts is not None:
+            nbytes += self.counts.finish()
+            os.replace(self.counts.path, self.paths[1])
+        nbytes += self.content.finish()
+        # content last: a readable content file means the entry is complete
+        os.replace(self.content.path, self.paths[0])
+        self.cache._stored(nbytes)
+
+    def abort(self):
+        for stream in (self.content, self.counts):
+            if stream is not None:
+                try:
+                    stream.abort()
+                except OSError:
+                    pass
+
+cache = BranchCache()
+
+def configure(enabled=None, max_bytes=None, directory=None):
+    cache.configure(enabled, max_bytes, directory)
+
+def stats():
+    return cache.stats()
+
+def flatten(chunk):
+    """Jagged branches come back as object arrays of per-entry arrays; flatten them."""
+    if chunk.dtype == object:
+        return np.concatenate(chunk) if len(chunk) else np.empty(0)
+    return chunk.reshape(-1)
+
+def _split(chunk):
+    """(flat content, per-entry counts or None) of a chunk read with library="np"."""
+    if chunk.dtype == object:
+        return flatten(chunk), np.fromiter((len(entry) for entry in chunk), dtype=np.int64, count=len(chunk))
+    return chunk, None
+
+def _jagged(content, counts):
+    """Object array of per-entry views into content, like uproot's library="np" output."""
+    offsets = np.cumsum(counts)
+    result = np.empty(len(counts), dtype=object)
+    result[:] = np.split(content, offsets[:-1]) if len(counts) else []
+    return result
+
+def parse_step_size(step_size, itemsize):
+    """Values per chunk for an uproot step_size (entry count, or a size such as "100 MB")."""
+    if isinstance(step_size, (int, np.integer)):
+        return max(1, int(step_size))
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([A-Za-z]*)\s*", str(step_size))
+    if match is None or match.group(2).lower() not in _SIZE_UNITS and match.group(2):
+        raise ValueError(f"Cannot interpret step_size {step_size!r}")
+    nbytes = float(match.group(1)) * _SIZE_UNITS.get(match.group(2).lower() or "b")
+    return max(1, int(nbytes // max(itemsize, 1)))
+
+def read_array(root_file, tree_name, branch_name):
+    """
+    tree[branch].array(library="np"), served from the branch cache when enabled.
+
+    On a miss the branch is read from ROOT as usual and written to the cache.
+    """
+    key = cache.key(root_file, tree_name, branch_name) if cache.enabled else None
+    if key is not None:
+        cached = cache.load(key)
+        if cached is not None:
+            content, counts = cached
+            return content if counts is None else _jagged(content, counts)
+
+    array = root_file[tree_name][branch_name].array(library="np")
+    if key is not None:
+        content, counts = _split(array)
+        writer = cache.writer(key, counts is not None)
+        try:
+            writer.write(content, counts)
+            writer.finish()
+        except Exception as e:
+            writer.abort()
+            print(f"Could not cache branch {branch_name}: {e}", file=sys.stderr)
+    return array
+
+def iterate(root_file, tree_name, branch_name, step_size="100 MB"):
+    """
+    Yields (entries, flat values) chunks of a branch.
+
+    With the cache enabled, a cached branch is sliced from the memory map; an
+    uncached one is read with TTree.iterate and written to the cache as it
+    streams past, provided the iteration runs to the end.
+    """
+    key = cache.key(root_file, tree_name, branch_name) if cache.enabled else None
+    cached = cache.load(key) if key is not None else None
+    if cached is not None:
+        content, counts = cached
+        step = parse_step_size(step_size, content.itemsize)
+        if counts is None:
+            for start in range(0, len(content), step):
+                values = content[start:start + step]
+                yield len(values), values
+            return
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        # entries per chunk so that a chunk holds about step values
+        entries_per_chunk = max(1, int(step * len(counts) / max(len(content), 1)))
+        for start in range(0, len(counts), entries_per_chunk):
+            stop = min(start + entries_per_chunk, len(counts))
+            yield stop - start, content[offsets[start]:offsets[stop]]
+        return
+
+    writer = None
+    try:
+        for chunk in root_file[tree_name].iterate([branch_name], step_size=step_size, library="np"):
+            values, counts = _split(chunk[branch_name])
+            if key is not None:
+                if writer is None:
+                    writer = cache.writer(key, counts is not None)
+                writer.write(values, counts)
+            yield len(chunk[branch_name]), values
+        if writer is not None:
+            writer.finish()
+            writer = None
+    finally:
+        if writer is not None:
+            # iteration stopped early or failed: never leave a partial entry
+            writer.abort()
+
+class BranchChunks:
+    """
+    Re-iterable view of a branch in chunks: every iteration re-reads the
+    branch (or slices the cached copy) and yields one flat array per chunk.
+
+    Node outputs may be cached and handed to several consumers, so a
+    one-shot generator would come back exhausted on the next run.
+    """
+    def __init__(self, root_file, tree_name, branch_name, step_size="100 MB"):
+        self.root_file = root_file
+        self.tree_name = tree_name
+        self.branch_name = branch_name
+        self.step_size = step_size
+
+    def __iter__(self):
+        for _, values in iterate(self.root_file, self.tree_name, self.branch_name, self.step_size):
+            yield values
+
+    def __repr__(self):
+        return f"BranchChunks({self.tree_name}/{self.branch_name}, step_size={self.step_size!r})"
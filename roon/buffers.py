@@ -0,0 +1,178 @@
+import secrets
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from roon import server
+
+# results smaller than this still go through the JSON bridge as before
+MIN_EXPORT_BYTES = 64 * 1024
+# total size of the arrays kept alive by handles; the UI rarely releases them
+MAX_EXPORTED_BYTES = 1 << 30
+
+class BufferEntry:
+    __slots__ = ("obj", "view", "shape", "dtype", "itemsize")
+
+    def __init__(self, obj, view, shape, dtype, itemsize):
+        # obj keeps the exported array alive for as long as the handle exists
+        self.obj = obj
+        self.view = view
+        self.shape = shape
+        self.dtype = dtype
+        self.itemsize = itemsize
+
+    @property
+    def row_bytes(self):
+        if not self.shape:
+            return self.view.nbytes
+        return self.view.nbytes // max(self.shape[0], 1)
+
+def _as_bytes_view(obj):
+    """
+    Flat, C-contiguous byte view of obj's memory; copies only if obj is not contiguous.
+
+    Returns:
+        tuple: (object owning the memory, byte memoryview, item size)
+    """
+    view = memoryview(obj)
+    if not view.c_contiguous:
+        # non-contiguous numpy views must be compacted first
+        import numpy as np
+        obj = np.ascontiguousarray(obj)
+        view = memoryview(obj)
+    return obj, view.cast("B"), view.itemsize
+
+def is_exportable(obj):
+    """Arrays with a fixed-size dtype (numpy, or anything exposing __array_interface__)."""
+    interface = getattr(obj, "__array_interface__", None)
+    if not isinstance(interface, dict):
+        return False
+    typestr = interface.get("typestr", "|O")
+    # object arrays hold pointers, not data; datetime64/timedelta64 have no buffer format
+    return typestr[1:2] not in ("O", "M", "m")
+
+class BufferRegistry:
+    """
+    Arrays exported from the Python namespace by handle.
+
+    Exporting keeps a reference to the array and a memoryview over its
+    memory; the HTTP endpoint writes slices of that view straight to the
+    socket, so the data is never converted to JSON or copied into Python
+    lists. The least recently used handles are released once more than
+    max_handles are alive or they hold more than max_bytes together; the
+    newest handle is always kept.
+    """
+    def __init__(self, max_handles=64, max_bytes=MAX_EXPORTED_BYTES):
+        self.max_handles = max_handles
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def export(self, obj):
+        """
+        Register obj and describe it.
+
+        Returns:
+            dict: {"handle", "shape", "dtype", "itemsize", "nbytes", "url"}
+        """
+        interface = obj.__array_interface__
+        obj, view, itemsize = _as_bytes_view(obj)
+        entry = BufferEntry(obj, view, tuple(interface["shape"]), interface["typestr"], itemsize)
+        handle = secrets.token_urlsafe(12)
+        with self._lock:
+            self._entries[handle] = entry
+            self._bytes += view.nbytes
+            while len(self._entries) > 1 and (len(self._entries) > self.max_handles or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.view.nbytes
+        return describe(handle, entry)
+
+    def get(self, handle):
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                self._entries.move_to_end(handle)
+            return entry
+
+    def release(self, handle):
+        with self._lock:
+            entry = self._entries.pop(handle, None)
+            if entry is None:
+                return False
+            self._bytes -= entry.view.nbytes
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return self._bytes
+
+def describe(handle, entry):
+    return {
+        "__buffer__": True,
+        "handle": handle,
+        "shape": list(entry.shape),
+        "dtype": entry.dtype,
+        "itemsize": entry.itemsize,
+        "nbytes": entry.view.nbytes,
+        "url": f"{server.base_url() or ''}/buffer/{handle}",
+    }
+
+registry = BufferRegistry()
+
+def wrap_result(value, min_bytes=MIN_EXPORT_BYTES):
+    """Replace a large array by a buffer handle; anything else is returned unchanged."""
+    if not is_exportable(value):
+        return value
+    if getattr(value, "nbytes", 0) < min_bytes:
+        return value
+    try:
+        return registry.export(value)
+    except (TypeError, ValueError, NotImplementedError):
+        # no usable buffer (e.g. an exotic dtype); the caller summarizes it instead
+        return value
+
+def serve_buffer(handler, url):
+    """
+    HTTP route /buffer/<handle>?start=&stop= returning raw bytes of rows [start, stop).
+
+    Rows are slices along the first axis. The response carries the dtype and
+    the shape of the slice in X-Roon-Dtype / X-Roon-Shape headers.
+    """
+    handle = url.path[len("/buffer/"):]
+    entry = registry.get(handle)
+    if entry is None:
+        handler.send_error(404, "Unknown or released buffer")
+        return
+
+    query = parse_qs(url.query)
+    rows = entry.shape[0] if entry.shape else 1
+    try:
+        start = int(query.get("start", [0])[0])
+        stop = int(query.get("stop", [rows])[0])
+    except ValueError:
+        handler.send_error(400, "start and stop must be integers")
+        return
+    start, stop, _ = slice(start, stop).indices(rows)
+    stop = max(start, stop)
+
+    row_bytes = entry.row_bytes
+    body = entry.view[start * row_bytes:stop * row_bytes]
+    shape = [stop - start] + list(entry.shape[1:]) if entry.shape else []
+
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/octet-stream")
+    handler.send_header("Content-Length", str(body.nbytes))
+    handler.send_header("Cache-Control", "no-store")
+    handler.send_header("X-Roon-Dtype", entry.dtype)
+    handler.send_header("X-Roon-Shape", ",".join(str(n) for n in shape))
+    handler.send_header("Access-Control-Expose-Headers", "X-Roon-Dtype, X-Roon-Shape")
+    handler.end_headers()
+    if handler.command != "HEAD":
+        handler.wfile.write(body)
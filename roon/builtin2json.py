@@ -3,6 +3,8 @@ import inspect
 import importlib
 from typing import get_type_hints, Tuple, Dict, get_origin, get_args
 
+import roon.catalog as catalog
+
 def format_type(type_obj):
     """Convert type objects to clean string representations."""
     if type_obj is None or type_obj == inspect._empty:
@@ -20,7 +22,7 @@ def format_type(type_obj):
             return f"list[{format_type(args[0])}]"
     return str(type_obj).replace("<class '", "").replace("'>", "")
 
-def analyze_installed_module_functions(module_name, output_dir=""):
+def analyze_installed_module_functions(module_name, output_dir="", use_cache=True):
     """
     Analyzes functions in an installed Python module and generates JSON representations.
     
@@ -28,10 +30,19 @@ def analyze_installed_module_functions(module_name, output_dir=""):
         module_name (str): Name of the installed module (e.g., "numpy", "matplotlib.pyplot").
         output_dir (str): Directory where JSON files will be saved (default: current directory).
                           If None, returns JSON strings instead.
+        use_cache (bool): When returning JSON strings, reuse the on-disk catalog for the
+                          installed version of the module (see roon.catalog)
     
     Returns:
         dict: Mapping of function names to their JSON file paths (if output_dir is provided) or JSON strings.
     """
+    cache_key = None
+    if output_dir is None and use_cache:
+        cache_key = catalog.installed_module_key(module_name)
+        cached = catalog.load(cache_key)
+        if cached is not None:
+            return cached
+
     # Dynamically import the module
     try:
         module = importlib.import_module(module_name)
@@ -103,6 +114,8 @@ def analyze_installed_module_functions(module_name, output_dir=""):
                 json.dump(function_json, f, indent=4)
             result[func_name] = output_file
     
+    if cache_key is not None:
+        catalog.store(cache_key, result)
     return result
 
 
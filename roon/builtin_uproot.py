@@ -2,8 +2,13 @@ import uproot
 import json
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import TypedDict
+from typing import Iterable, TypedDict, Union
 import os
+import glob
+import time
+
+from roon import binning, branchcache, datasets, rootfiles
+from roon.accumulators import Histogram, RunningStats
 
 class RootFileResult(TypedDict):
     """
@@ -22,15 +27,16 @@ def open_root_file(path: str = "/example.root") -> RootFileResult:
       - the file object
       - a list of top-level keys
       - a JSON 'view' of classnames for quick inspection
+    The handle comes from a process-wide pool, so re-runs and other nodes
+    opening the same (unchanged) file share it and its parsed metadata.
     """
     try:
         if not os.path.exists(path):
             raise FileNotFoundError(f"File {path} not found in Pyodide file system")
         if os.path.getsize(path) == 0:
             raise ValueError(f"File {path} is empty")
-        f = uproot.open(path)
         print(f"Opening ROOT file: {path}")
-        f = uproot.open(path)
+        f = rootfiles.open_file(path)
         view = json.dumps(f.classnames(), indent=4)
         return {
             "file": f,
@@ -41,6 +47,13 @@ def open_root_file(path: str = "/example.root") -> RootFileResult:
         print(f"Error opening {path}: {e}")
         raise
 
+def open_tree(path: str, tree_name: str) -> any:
+    """
+    Returns the TTree tree_name from the file at path through the shared file
+    pool; the tree's branch metadata is parsed only once per file version.
+    """
+    return rootfiles.get_tree(path, tree_name)
+
 class TreeArrayResult(TypedDict):
     """
     Represents the outcome of reading a TTree branch.
@@ -58,27 +71,214 @@ def read_tree_branch(
     """
     Reads a single branch from a TTree in the given RootFileResult.
     Returns the data as a NumPy array, plus basic statistics.
+    The whole branch is loaded into memory; for large files use
+    iterate_tree_branch or branch_stats, which read it in chunks.
     """
     # Retrieve the opened file object from the typed dict
     f = root_file
-    # Access the TTree
-    tree = f[tree_name]
-    # Read the branch into a NumPy array
-    arr = tree[branch_name].array(library="np")
+    # Read the branch into a NumPy array (memory-mapped if the branch cache holds it)
+    arr = branchcache.read_array(f, tree_name, branch_name)
 
     # Compute basic stats
-    stats = {
-        "mean": float(np.mean(arr)),
-        "std": float(np.std(arr)),
-        "min": float(np.min(arr)),
-        "max": float(np.max(arr)),
-    }
+    stats = RunningStats().update(branchcache.flatten(arr)).to_dict()
 
     return {
         "array": arr,
         "stats": stats,
     }
 
+def iterate_tree_branch(
+    root_file: uproot.ReadOnlyDirectory,
+    tree_name: str,
+    branch_name: str,
+    step_size: str = "100 MB"
+) -> Iterable[np.ndarray]:
+    """
+    Reads a branch in chunks of step_size (a number of entries or a size such
+    as "100 MB"), yielding one flat NumPy array per chunk. Only one chunk is
+    held in memory at a time. The result can be iterated again; each pass
+    re-reads the branch.
+    """
+    return branchcache.BranchChunks(root_file, tree_name, branch_name, step_size)
+
+class BranchStatsResult(TypedDict):
+    """
+    Represents the outcome of a streaming pass over a TTree branch.
+    - stats: count, mean, std, min and max of all values, mergeable with
+      the stats of other files
+    - entries: number of tree entries read
+    - chunks: number of chunks the branch was read in
+    """
+    stats: RunningStats
+    entries: int
+    chunks: int
+
+def branch_stats(
+    root_file: uproot.ReadOnlyDirectory,
+    tree_name: str,
+    branch_name: str,
+    step_size: str = "100 MB"
+) -> BranchStatsResult:
+    """
+    Computes mean, std, min and max of a branch in a single streaming pass,
+    so memory stays bounded by step_size however large the file is.
+    """
+    stats = RunningStats()
+    entries = 0
+    chunks = 0
+    for chunk_entries, values in branchcache.iterate(root_file, tree_name, branch_name, step_size):
+        entries += chunk_entries
+        chunks += 1
+        stats.update(values)
+    return {
+        "stats": stats,
+        "entries": entries,
+        "chunks": chunks,
+    }
+
+def fill_histogram(
+    root_file: uproot.ReadOnlyDirectory,
+    tree_name: str,
+    branch_name: str,
+    bins: int = 50,
+    low: float = 0.0,
+    high: float = 1.0,
+    step_size: str = "100 MB"
+) -> Histogram:
+    """
+    Fills a fixed-binning histogram of a branch chunk by chunk, without
+    materializing the branch. Histograms of other files with the same
+    binning can be merged with +.
+    """
+    hist = Histogram(bins, low, high)
+    for _, values in branchcache.iterate(root_file, tree_name, branch_name, step_size):
+        hist.fill(values)
+    return hist
+
+def dataset_files(files) -> list[str]:
+    """
+    Expands a dataset specification into a sorted list of paths: a glob
+    pattern ("prod/*.picoDst.root"), several patterns separated by commas,
+    or a list of paths/patterns.
+    """
+    patterns = files.split(",") if isinstance(files, str) else list(files)
+    paths = []
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern.strip())
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        paths.extend(sorted(matches))
+    if not paths:
+        raise FileNotFoundError(f"No files match {files!r}")
+    # keep the order but drop duplicates from overlapping patterns
+    return list(dict.fromkeys(paths))
+
+class DatasetResult(TypedDict):
+    """
+    Represents the outcome of scanning a multi-file dataset.
+    - stats: branch -> RunningStats merged over all files
+    - histograms: branch -> Histogram merged over all files (only when a range was given)
+    - files: per-file throughput (entries, compressed bytes, seconds, events/s, MB/s)
+    - errors: path -> message for files that could not be processed
+    - throughput: totals over the dataset, events/s and MB/s use wall time
+    """
+    stats: dict[str, RunningStats]
+    histograms: dict[str, Histogram]
+    files: list[dict]
+    errors: dict[str, str]
+    throughput: dict[str, float]
+
+def process_dataset(
+    files: any,
+    tree_name: str,
+    branches: list[str],
+    bins: int = 50,
+    range: tuple[float, float] = None,
+    step_size: str = "100 MB",
+    max_workers: int = None
+) -> DatasetResult:
+    """
+    Scans branches across many ROOT files, one file per worker process, and
+    merges the per-file statistics (and histograms when range is given).
+    Files that fail are reported in errors instead of aborting the scan.
+    """
+    if isinstance(branches, str):
+        branches = [branches]
+    paths = dataset_files(files)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(paths)))
+    args = (tree_name, list(branches), bins, tuple(range) if range is not None else None, step_size)
+
+    stats = {branch: RunningStats() for branch in branches}
+    hists = {branch: Histogram(bins, *range) for branch in branches} if range is not None else {}
+    reports = {}
+    errors = {}
+
+    def collect(path, result):
+        for branch in branches:
+            stats[branch].merge(result["stats"][branch])
+            if branch in hists:
+                hists[branch].merge(result["histograms"][branch])
+        reports[path] = result["report"]
+        report = result["report"]
+        print(f"{path}: {report['entries']} entries, {report['events_per_second']:.0f} events/s, "
+              f"{report['mb_per_second']:.1f} MB/s")
+
+    start = time.perf_counter()
+    if max_workers == 1:
+        for path in paths:
+            try:
+                collect(path, datasets.scan_file(path, *args))
+            except Exception as e:
+                errors[path] = f"{type(e).__name__}: {e}"
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        # spawn: forking a process that runs a GUI event loop and threads is unsafe
+        with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(datasets.scan_file, path, *args): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    collect(path, future.result())
+                except Exception as e:
+                    errors[path] = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+
+    entries = sum(report["entries"] for report in reports.values())
+    read_bytes = sum(report["bytes"] for report in reports.values())
+    return {
+        "stats": stats,
+        "histograms": hists,
+        # input order, not completion order
+        "files": [reports[path] for path in paths if path in reports],
+        "errors": errors,
+        "throughput": {
+            "files": len(reports),
+            "entries": entries,
+            "bytes": read_bytes,
+            "seconds": seconds,
+            "events_per_second": entries / seconds if seconds else 0.0,
+            "mb_per_second": read_bytes / 1e6 / seconds if seconds else 0.0,
+        },
+    }
+
+def configure_branch_cache(enabled: bool = True, max_gb: float = 10.0) -> dict:
+    """
+    Turns the local branch cache on or off. When on, branches read by these
+    nodes are written to .npy files and memory-mapped on later reads instead
+    of being decompressed again. Returns the cache statistics.
+    """
+    branchcache.configure(enabled=enabled, max_bytes=int(max_gb * 1024 ** 3))
+    return branchcache.stats()
+
+def branch_cache_report() -> dict:
+    """
+    Statistics of the local branch cache: entries, size on disk, hits,
+    misses, bytes memory-mapped and written.
+    """
+    return branchcache.stats()
+
 class PlotResult(TypedDict):
     """
     Represents the outcome of creating a plot.
@@ -89,7 +289,7 @@ class PlotResult(TypedDict):
     description: str
 
 def plot_histogram(
-    data: np.ndarray,
+    data: Union[np.ndarray, Histogram],
     bins: int = 50,
     out_path: str = "hist.png",
     title: str = "Histogram"
@@ -97,9 +297,17 @@ def plot_histogram(
     """
     Creates a histogram of the given data using matplotlib, saves the figure to 'out_path',
     and returns a small typed dict with the path and a description.
+    An already filled Histogram is drawn as is and bins is ignored; bins <= 0
+    chooses the binning automatically (see roon.binning).
     """
     plt.figure()
-    plt.hist(data, bins=bins, edgecolor='black')
+    if isinstance(data, Histogram):
+        data.plot(histtype="bar", edgecolor='black')
+    elif bins <= 0:
+        bins, low, high = binning.choose_binning(data)
+        plt.hist(data, bins=bins, range=(low, high), edgecolor='black')
+    else:
+        plt.hist(data, bins=bins, edgecolor='black')
     plt.title(title)
     plt.xlabel("Value")
     plt.ylabel("Frequency")
@@ -0,0 +1,65 @@
+import sys
+import threading
+from contextlib import contextmanager
+
+class ThreadRoutedStream:
+    """
+    Stand-in for sys.stdout / sys.stderr that forwards writes to a target
+    chosen per thread.
+
+    Swapping sys.stdout for a StringIO is process wide, so two things running
+    at once (parallel graph nodes, concurrent jobs) would steal each other's
+    output. With this stream installed every thread can redirect into its own
+    buffer; threads without a target write to the stream that was in place
+    when it was installed.
+    """
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self._targets = {}
+
+    def _target(self):
+        return self._targets.get(threading.get_ident(), self.fallback)
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+_install_lock = threading.Lock()
+
+def install():
+    """Replace sys.stdout and sys.stderr with thread routed streams (idempotent)."""
+    with _install_lock:
+        if not isinstance(sys.stdout, ThreadRoutedStream):
+            sys.stdout = ThreadRoutedStream(sys.stdout)
+        if not isinstance(sys.stderr, ThreadRoutedStream):
+            sys.stderr = ThreadRoutedStream(sys.stderr)
+    return sys.stdout, sys.stderr
+
+@contextmanager
+def redirect(stdout=None, stderr=None):
+    """
+    Send the current thread's stdout/stderr to the given file-like objects.
+
+    Args:
+        stdout: Target for print() and sys.stdout writes (None keeps the current one)
+        stderr: Target for sys.stderr writes (None keeps the current one)
+    """
+    routed = install()
+    ident = threading.get_ident()
+    previous = [stream._targets.get(ident) for stream in routed]
+    for stream, target in zip(routed, (stdout, stderr)):
+        if target is not None:
+            stream._targets[ident] = target
+    try:
+        yield
+    finally:
+        for stream, target in zip(routed, previous):
+            if target is None:
+                stream._targets.pop(ident, None)
+            else:
+                stream._targets[ident] = target
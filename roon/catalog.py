@@ -0,0 +1,428 @@
+import json
+import os
+import re
+import sys
+import hashlib
+import functools
+import threading
+import time
+from collections import deque
+import importlib.util
+
+# bump when the JSON produced by the *2json modules changes shape
+CATALOG_FORMAT = 1
+
+def cache_dir():
+    """Directory holding cached node catalogs (ROON_CACHE_DIR, else the user cache dir)."""
+    base = os.environ.get("ROON_CACHE_DIR")
+    if not base:
+        base = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "roon")
+    return os.path.join(base, "catalog")
+
+@functools.lru_cache(maxsize=1)
+def _packages_distributions():
+    from importlib import metadata
+    try:
+        return metadata.packages_distributions()
+    except AttributeError:
+        # Python < 3.10
+        return {}
+
+def _module_origin(module_name):
+    """File defining module_name, if it can be located without importing anything new."""
+    parent = module_name.rpartition(".")[0]
+    if parent and parent not in sys.modules:
+        # find_spec would import the parent package
+        return None
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+    return spec.origin
+
+def _module_stamp(module_name):
+    """
+    Version of the distribution providing module_name, without importing it.
+
+    When the module's file can be located cheaply its mtime is included as
+    well, so editable installs and local packages are invalidated on edits.
+    """
+    # imported here to keep `import roon.catalog` cheap at startup
+    from importlib import metadata
+
+    stamps = []
+    top_level = module_name.split(".")[0]
+    for dist in _packages_distributions().get(top_level, [top_level]):
+        try:
+            stamps.append(f"{dist}=={metadata.version(dist)}")
+            break
+        except metadata.PackageNotFoundError:
+            continue
+    origin = _module_origin(module_name)
+    if origin is not None:
+        stamps.append(f"{origin}@{os.stat(origin).st_mtime_ns}")
+    return "|".join(stamps) or None
+
+def installed_module_key(module_name):
+    """
+    Cache key for builtin2json.analyze_installed_module_functions.
+
+    Returns:
+        tuple: (name, digest) or None when the module cannot be located
+    """
+    stamp = _module_stamp(module_name)
+    if stamp is None:
+        return None
+    return module_name, _digest(["module", module_name, stamp])
+
+def module_file_key(module_path, base_path=None):
+    """Cache key for allpy2json.analyze_module_functions, based on the file contents."""
+    try:
+        with open(module_path, "rb") as f:
+            content = hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+    path = os.path.realpath(module_path)
+    # the name must differ between same-named files in different directories,
+    # store() drops every other entry with the same name
+    name = f"{os.path.basename(path)}-{hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]}"
+    return name, _digest(["file", path, base_path, content])
+
+def _digest(parts):
+    payload = json.dumps(parts + [CATALOG_FORMAT, sys.version_info[:2]])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+def _entry_path(key):
+    name, digest = key
+    return os.path.join(cache_dir(), f"{_safe_name(name)}-{digest}.json")
+
+def load(key):
+    """Cached catalog for key, or None on a miss."""
+    if key is None:
+        return None
+    try:
+        with open(_entry_path(key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def store(key, catalog):
+    """Write catalog for key and drop older entries for the same name."""
+    if key is None:
+        return
+    path = _entry_path(key)
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(catalog, f)
+        os.replace(tmp_path, path)
+
+        prefix = _safe_name(key[0]) + "-"
+        for entry in os.listdir(directory):
+            stale = os.path.join(directory, entry)
+            if entry.startswith(prefix) and entry.endswith(".json") and stale != path \
+                    and len(entry) == len(os.path.basename(path)):
+                os.remove(stale)
+    except OSError as e:
+        # the cache is an optimisation only
+        print(f"Could not write node catalog cache {path}: {e}", file=sys.stderr)
+
+def clear_cache():
+    """Remove every cached catalog."""
+    directory = cache_dir()
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for entry in os.listdir(directory):
+        if entry.endswith(".json"):
+            os.remove(os.path.join(directory, entry))
+            removed += 1
+    return removed
+
+# ---------------------------------------------------------------------------
+# Two-tier access: a compact searchable index, full definitions on demand
+# ---------------------------------------------------------------------------
+
+# parsed catalogs per (kind, source, base_path, cache key); a new cache key
+# (package upgraded, file edited) simply misses here as well
+_parsed = {}
+_parsed_lock = threading.Lock()
+
+def definitions(source, kind="module", base_path=None):
+    """
+    Parsed catalog of an installed module or a node file.
+
+    Args:
+        source (str): Module name (kind="module") or path to a .py file (kind="file"/"static")
+        kind (str): "module" uses builtin2json, "file" uses allpy2json and "static"
+                    parses the file with ast2json without importing it
+        base_path (str): Prefix removed from file paths in the "module" field
+
+    Returns:
+        dict: Mapping of function names to node definition dicts
+    """
+    if kind == "module":
+        from roon import builtin2json
+        key = installed_module_key(source)
+        produce = lambda: builtin2json.analyze_installed_module_functions(source, None)
+    elif kind == "file":
+        from roon import allpy2json
+        key = module_file_key(source, base_path)
+        produce = lambda: allpy2json.analyze_module_functions(source, None, base_path)
+    elif kind == "static":
+        from roon import ast2json
+        # parsing is cheap, only the in-memory copy is kept
+        key = module_file_key(source, base_path)
+        produce = lambda: ast2json.analyze_file(source, None, base_path)
+    else:
+        raise ValueError(f"Unknown catalog kind '{kind}', expected 'module', 'file' or 'static'")
+
+    memo_key = (kind, source, base_path, key)
+    with _parsed_lock:
+        if key is not None and memo_key in _parsed:
+            return _parsed[memo_key]
+    parsed = {name: json.loads(text) for name, text in produce().items()}
+    with _parsed_lock:
+        for stale in [k for k in _parsed if k[:3] == memo_key[:3]]:
+            del _parsed[stale]
+        _parsed[memo_key] = parsed
+    return parsed
+
+def index_entry(definition, source, kind):
+    inputs = definition["inputs"]
+    return {
+        "name": definition["name"],
+        "module": definition["module"],
+        "source": source,
+        "kind": kind,
+        "arity": len(inputs),
+        "required": sum(1 for spec in inputs if spec["default"] is None),
+    }
+
+def node_index(modules=(), files=(), base_path=None, static=False):
+    """
+    Compact index (name, module, arity) of every node in the given modules and files.
+
+    With static=True the files are parsed instead of imported (see ast2json).
+
+    Full definitions, including source text and docstrings, stay on the Python
+    side until requested with node_definition.
+    """
+    entries = []
+    for kind, sources in (("module", modules), ("static" if static else "file", files)):
+        for source in sources:
+            for definition in definitions(source, kind, base_path).values():
+                entries.append(index_entry(definition, source, kind))
+    return entries
+
+def search_nodes(query, modules=(), files=(), base_path=None, limit=50, static=False):
+    """
+    Index entries whose name or module contains query (case-insensitive).
+
+    Name prefix matches come first, then module prefix matches, then other
+    substring matches; each group is sorted by name.
+    """
+    query = query.lower()
+    ranked = []
+    for entry in node_index(modules, files, base_path, static):
+        name = entry["name"].lower()
+        module = str(entry["module"]).lower()
+        if name.startswith(query):
+            rank = 0
+        elif module.startswith(query):
+            rank = 1
+        elif query in name:
+            rank = 2
+        elif query in module:
+            rank = 3
+        else:
+            continue
+        ranked.append((rank, name, entry))
+    ranked.sort(key=lambda item: item[:2])
+    return [entry for _, _, entry in ranked[:limit]]
+
+def node_definition(source, name, kind="module", base_path=None):
+    """Full node definition (inputs, outputs, docstring, source) of one function."""
+    found = definitions(source, kind, base_path).get(name)
+    if found is None:
+        raise KeyError(f"No node '{name}' in {kind} '{source}'")
+    return found
+
+# ---------------------------------------------------------------------------
+# Bulk introspection in worker processes
+# ---------------------------------------------------------------------------
+
+def _analyze(kind, source, base_path):
+    if kind == "module":
+        from roon import builtin2json
+        return builtin2json.analyze_installed_module_functions(source, None)
+    if kind == "file":
+        from roon import allpy2json
+        return allpy2json.analyze_module_functions(source, None, base_path)
+    from roon import ast2json
+    return ast2json.analyze_file(source, None, base_path)
+
+def _catalog_worker(conn):
+    """Worker process loop: analyze (kind, source, base_path) tasks until told to stop."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        start = time.perf_counter()
+        try:
+            conn.send(("ok", _analyze(*task), time.perf_counter() - start))
+        except BaseException as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", time.perf_counter() - start))
+
+def expand_sources(sources, static=False):
+    """
+    Turn module names, .py paths and directories into (kind, source) tasks.
+
+    Directories are searched recursively for .py files.
+    """
+    file_kind = "static" if static else "file"
+    tasks = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+                tasks.extend((file_kind, os.path.join(root, name)) for name in sorted(files) if name.endswith(".py"))
+        elif source.endswith(".py") or os.path.isfile(source):
+            tasks.append((file_kind, source))
+        else:
+            tasks.append(("module", source))
+    return tasks
+
+def build_catalog(sources, max_workers=None, timeout=60, static=False, base_path=None):
+    """
+    Introspects many modules and node files in parallel worker processes.
+
+    Each module is analyzed in a separate process, so loads cannot clobber
+    each other and a module that hangs or crashes only costs its own entry:
+    after timeout seconds its worker is killed and replaced. Entries already
+    in the on-disk cache are answered without starting a worker.
+
+    Args:
+        sources (list): Installed module names, paths to .py files and directories
+        max_workers (int): Number of worker processes (default: CPU count)
+        timeout (float): Seconds allowed per module
+        static (bool): Parse files with ast2json instead of importing them
+        base_path (str): Prefix removed from file paths in the "module" field
+
+    Returns:
+        dict: {"catalog": {source: {function name: JSON}}, "errors": {source: message},
+               "timings": {source: seconds}}
+    """
+    catalog = {}
+    errors = {}
+    timings = {}
+
+    pending = deque()
+    for kind, source in expand_sources(sources, static):
+        if kind == "module":
+            cached = load(installed_module_key(source))
+        elif kind == "file":
+            cached = load(module_file_key(source, base_path))
+        else:
+            cached = None
+        if cached is not None:
+            catalog[source] = cached
+            timings[source] = 0.0
+        else:
+            pending.append((kind, source))
+    if not pending:
+        return {"catalog": catalog, "errors": errors, "timings": timings}
+
+    # imported here to keep `import roon.catalog` cheap at startup
+    import multiprocessing
+    import multiprocessing.connection
+
+    context = multiprocessing.get_context("spawn")
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+
+    def start_worker():
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(target=_catalog_worker, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        # [process, connection, (kind, source) in progress, deadline]
+        return [process, parent_conn, None, None]
+
+    def replace_worker(index):
+        # kill a hung or crashed worker; only start a new one if there is work left
+        process = workers[index][0]
+        if process.is_alive():
+            process.kill()
+        process.join()
+        workers[index] = start_worker() if pending else [process, workers[index][1], None, None]
+
+    workers = [start_worker() for _ in range(max_workers)]
+    try:
+        while pending or any(worker[2] is not None for worker in workers):
+            for index, worker in enumerate(workers):
+                if worker[2] is None and pending:
+                    task = pending.popleft()
+                    try:
+                        worker[1].send((task[0], task[1], base_path))
+                    except OSError:
+                        # the worker died while idle
+                        worker[0].join()
+                        errors[task[1]] = f"worker exited with code {worker[0].exitcode}"
+                        replace_worker(index)
+                        continue
+                    worker[2] = task
+                    worker[3] = time.monotonic() + timeout
+
+            busy = [worker for worker in workers if worker[2] is not None]
+            if not busy:
+                continue
+            next_deadline = min(worker[3] for worker in busy)
+            ready = multiprocessing.connection.wait(
+                [worker[1] for worker in busy], timeout=max(0.0, next_deadline - time.monotonic())
+            )
+
+            for index, worker in enumerate(workers):
+                if worker[2] is None:
+                    continue
+                source = worker[2][1]
+                if worker[1] in ready:
+                    try:
+                        status, payload, elapsed = worker[1].recv()
+                    except (EOFError, OSError):
+                        # crashed, or reset the connection before reading its task
+                        worker[0].join()
+                        errors[source] = f"worker exited with code {worker[0].exitcode}"
+                        replace_worker(index)
+                        continue
+                    timings[source] = elapsed
+                    if status == "ok":
+                        catalog[source] = payload
+                    else:
+                        errors[source] = payload
+                    worker[2] = None
+                elif time.monotonic() >= worker[3]:
+                    errors[source] = f"timed out after {timeout}s"
+                    timings[source] = timeout
+                    replace_worker(index)
+    finally:
+        for worker in workers:
+            try:
+                worker[1].send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker[0].join(1)
+            if worker[0].is_alive():
+                worker[0].kill()
+
+    return {"catalog": catalog, "errors": errors, "timings": timings}
@@ -0,0 +1,40 @@
+import time
+
+import uproot
+
+from roon import branchcache
+from roon.accumulators import Histogram, RunningStats
+
+# Per-file worker of the process_dataset node. It lives outside the node
+# modules so it is not listed as a node, and spawned worker processes
+# import this small module instead of a node file.
+
+def scan_file(path, tree_name, branches, bins, range, step_size):
+    """Stats (and histograms, when range is given) of branches in one ROOT file, plus read throughput."""
+    start = time.perf_counter()
+    stats = {branch: RunningStats() for branch in branches}
+    hists = {branch: Histogram(bins, *range) for branch in branches} if range is not None else {}
+    entries = 0
+    with uproot.open(path) as f:
+        tree = f[tree_name]
+        read_bytes = sum(tree[branch].compressed_bytes for branch in branches)
+        for chunk in tree.iterate(branches, step_size=step_size, library="np"):
+            entries += len(chunk[branches[0]])
+            for branch in branches:
+                values = branchcache.flatten(chunk[branch])
+                stats[branch].update(values)
+                if branch in hists:
+                    hists[branch].fill(values)
+    seconds = time.perf_counter() - start
+    return {
+        "stats": stats,
+        "histograms": hists,
+        "report": {
+            "path": path,
+            "entries": entries,
+            "bytes": read_bytes,
+            "seconds": seconds,
+            "events_per_second": entries / seconds if seconds else 0.0,
+            "mb_per_second": read_bytes / 1e6 / seconds if seconds else 0.0,
+        },
+    }
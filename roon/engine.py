@@ -1,5 +1,16 @@
 import json
-from collections import defaultdict, deque
+import hashlib
+import importlib
+import builtins
+import io
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from roon import capture, jobs
 
 def module_import_star(module_path):
     return f"import {module_path}"
@@ -12,12 +23,8 @@ def normalize_module_path(module_path):
         module_path = module_path[2:]
     return module_path.replace("/", ".")
 
-def generate_python_script(json_data):
-    nodes = json_data['nodes']
-    connections = json_data['connections']
-    node_dict = {node['id']: node for node in nodes}
-
-    # Build dependency graph for topological sort
+def topological_order(nodes, connections):
+    """Return node ids in dependency order (Kahn's algorithm)."""
     adj_list = defaultdict(list)
     incoming_degree = {node['id']: 0 for node in nodes}
     for conn in connections:
@@ -26,7 +33,6 @@ def generate_python_script(json_data):
         adj_list[from_node].append(to_node)
         incoming_degree[to_node] += 1
 
-    # Topological sort
     queue = deque([nid for nid in incoming_degree if incoming_degree[nid] == 0])
     order = []
     while queue:
@@ -38,13 +44,34 @@ def generate_python_script(json_data):
                 queue.append(neighbor)
     if len(order) != len(nodes):
         raise ValueError("Cycle detected in the node graph")
+    return order
 
-    # Map connections: (to_node, input_name) → (from_node, output_name)
-    connections_map = {
+def build_connections_map(connections):
+    """Map (to_node, input_name) -> (from_node, output_name)."""
+    return {
         (conn['to']['node'], conn['to']['input']): (conn['from']['node'], conn['from']['output'])
         for conn in connections
     }
 
+def generate_python_script(json_data, free_intermediates=False, pinned=()):
+    """
+    Render the graph as a standalone Python script (used for "export to .py"; execution goes through compile_plan).
+
+    With free_intermediates=True each node output variable is deleted right
+    after the line of its last consumer, so large intermediate arrays do not
+    stay alive until the end of the script. Outputs nobody reads and those
+    of the pinned node ids are kept.
+    """
+    nodes = json_data['nodes']
+    connections = json_data['connections']
+    node_dict = {node['id']: node for node in nodes}
+
+    # Topological sort
+    order = topological_order(nodes, connections)
+
+    # Map connections: (to_node, input_name) → (from_node, output_name)
+    connections_map = build_connections_map(connections)
+
     # Extract function definitions and module dependencies
     dependency_modules = set()
     function_defs = []
@@ -56,6 +83,19 @@ def generate_python_script(json_data):
             continue
         function_defs.append(node['source'])
 
+    # Last consumer of each node output (liveness), for free_intermediates
+    position = {node_id: index for index, node_id in enumerate(order)}
+    last_use = {}
+    if free_intermediates:
+        for from_node, to_node in {(conn['from']['node'], conn['to']['node']) for conn in connections}:
+            if from_node in pinned:
+                continue
+            if position[to_node] > position.get(last_use.get(from_node), -1):
+                last_use[from_node] = to_node
+    released_after = defaultdict(list)
+    for from_node, to_node in last_use.items():
+        released_after[to_node].append(from_node)
+
     # Generate execution lines
     execution_lines = []
     for node_id in order:
@@ -96,6 +136,16 @@ def generate_python_script(json_data):
         else:
             execution_lines.append(call)
 
+        released = []
+        for from_node in sorted(released_after[node_id], key=position.get):
+            from_outputs = node_dict[from_node]['outputs']
+            if len(from_outputs) == 1:
+                released.append(f"node_{from_node}_{from_outputs[0]['name']}")
+            else:
+                released.append(f"node_{from_node}_result")
+        if released:
+            execution_lines.append(f"del {', '.join(released)}")
+
     # Assemble the script
     module_import_star_lines = [module_import_star(module) for module in dependency_modules]
     # function_defs = []
@@ -105,4 +155,574 @@ def generate_python_script(json_data):
         "\n\n".join(function_defs) + "\n\n" +
         "\n".join(execution_lines)
     )
-    return script
\ No newline at end of file
+    return script
+
+
+# ---------------------------------------------------------------------------
+# In-process execution with a per-node result cache
+# ---------------------------------------------------------------------------
+
+_MISSING = object()
+
+class ResultCache:
+    """
+    Keeps the outputs of each node from previous runs.
+
+    Entries are stored per node id together with the node's fingerprint, so a
+    node is reused only while its source, literal inputs and upstream
+    fingerprints are unchanged. Anything downstream of an edited node gets a
+    new fingerprint and is therefore re-executed as well.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, node_id, fingerprint):
+        entry = self._entries.get(node_id)
+        if entry is None or entry[0] != fingerprint:
+            return _MISSING
+        return entry[1]
+
+    def put(self, node_id, fingerprint, value):
+        self._entries[node_id] = (fingerprint, value)
+
+    def peek(self, node_id):
+        """Last stored output of a node regardless of its fingerprint, or _MISSING."""
+        entry = self._entries.get(node_id)
+        return _MISSING if entry is None else entry[1]
+
+    def prune(self, node_ids):
+        """Drop entries for nodes that are no longer part of the graph."""
+        keep = set(node_ids)
+        for node_id in list(self._entries):
+            if node_id not in keep:
+                del self._entries[node_id]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+def node_fingerprint(node, input_keys):
+    """
+    Hash identifying one evaluation of a node.
+
+    Args:
+        node (dict): Node definition from the graph JSON
+        input_keys (list): One entry per input, either ("literal", name, repr(value))
+                           or ("link", name, upstream_fingerprint, output_name)
+
+    Returns:
+        str: Hex digest of the callable identity and its inputs
+    """
+    payload = json.dumps([
+        node.get('module'),
+        node['name'],
+        node.get('source'),
+        input_keys,
+    ])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def resolve_callable(node, namespace):
+    """Find the function a node calls, mirroring what generate_python_script emits."""
+    module = node.get('module')
+    if module and module != "<source>":
+        imported = importlib.import_module(normalize_module_path(module))
+        return getattr(imported, node['name'])
+    if 'source' in node:
+        exec(node['source'], namespace)
+    if node['name'] in namespace:
+        return namespace[node['name']]
+    return getattr(builtins, node['name'])
+
+def is_cacheable(node):
+    # Nodes without outputs only exist for their side effects (plots, prints),
+    # so they always run; a node can also opt out with "cache": false
+    return bool(node['outputs']) and node.get('cache', True)
+
+# ---------------------------------------------------------------------------
+# Compiled execution plans
+# ---------------------------------------------------------------------------
+
+def _ignore_value(node_id, value):
+    pass
+
+class PlanStep:
+    """
+    One node of a compiled plan.
+
+    bindings holds one entry per input, either ("literal", value) or
+    ("link", from_node, output_name) where output_name is None when the
+    upstream node has a single output and its return value is used as is.
+    """
+    __slots__ = ("node_id", "func", "bindings", "cacheable", "fingerprint", "importable")
+
+    def __init__(self, node_id, func, bindings, cacheable, fingerprint, importable=False):
+        self.node_id = node_id
+        self.func = func
+        self.bindings = bindings
+        self.cacheable = cacheable
+        self.fingerprint = fingerprint
+        # module-level functions can be pickled by reference and sent to worker processes
+        self.importable = importable
+
+    def upstream(self):
+        return {binding[1] for binding in self.bindings if binding[0] == "link"}
+
+    def arguments(self, results):
+        args = []
+        for binding in self.bindings:
+            if binding[0] == "literal":
+                args.append(binding[1])
+                continue
+            value = results[binding[1]]
+            if binding[2] is not None:
+                value = value[binding[2]]
+            args.append(value)
+        return args
+
+class Plan:
+    """
+    A node graph resolved once into callables, argument bindings and a
+    topological order, so it can be executed repeatedly without building or
+    compiling a script.
+    """
+    def __init__(self, graph_hash, steps, namespace):
+        self.graph_hash = graph_hash
+        self.steps = steps
+        self.order = [step.node_id for step in steps]
+        # keep the namespace alive; source-defined callables use it as their globals
+        self.namespace = namespace
+        # number of steps reading each node's output; outputs nobody reads are the graph's results
+        self.consumers = defaultdict(int)
+        for step in steps:
+            for from_node in step.upstream():
+                self.consumers[from_node] += 1
+
+    def __call__(self, cache=None, **kwargs):
+        return self.run(cache=cache, **kwargs)
+
+    def run(self, cache=None, max_workers=1, pool="thread", events=None, profiler=None,
+            release=False, pinned=(), on_value=None):
+        """
+        Executes the plan.
+
+        Args:
+            cache (ResultCache): Results from previous runs; None disables caching
+            max_workers (int): Nodes allowed to run at once; 1 runs strictly in
+                               topological order, None uses the executor default
+                               (CPU count for processes, CPU count + 4 up to 32 for threads)
+            pool (str): "thread" or "process"; with "process" module-level
+                        functions run in worker processes (arguments and results
+                        must be picklable) while source-defined nodes stay on threads
+            events (callable): Called with a dict for every node_started,
+                               node_finished and node_failed event
+            profiler: profiling.NodeProfiler (time, memory and output size per
+                      node) or profiling.HotspotProfiler (functions inside nodes);
+                      profiled nodes always run on threads, also with pool="process",
+                      and profilers marked sequential force max_workers=1
+            release (bool): Drop each intermediate output as soon as its last
+                            consumer has received it, so memory holds the live
+                            working set instead of every intermediate; results
+                            then only contain outputs nobody reads and pinned ones
+            pinned (iterable): Node ids whose outputs are kept with release=True
+                               (outputs stored in cache stay alive there anyway)
+            on_value (callable): Called as on_value(node_id, value) as soon as a
+                                 node's output is available, e.g. to summarize
+                                 outputs that are released later
+
+        Returns:
+            dict: {"results": node id -> return value, "executed": [ids], "cached": [ids]},
+                  plus "profile" (see NodeProfiler.report) when profiling and
+                  "released" (ids dropped early) with release=True
+        """
+        if events is None:
+            events = _ignore_event
+        if on_value is None:
+            on_value = _ignore_value
+        liveness = _Liveness(self.consumers, pinned) if release else None
+        if profiler is not None:
+            if getattr(profiler, "sequential", False):
+                max_workers = 1
+            profiler.start()
+        try:
+            if max_workers == 1:
+                results, executed, cached = self._run_sequential(cache, events, profiler, liveness, on_value)
+            else:
+                results, executed, cached = self._run_parallel(cache, max_workers, pool, events, profiler,
+                                                               liveness, on_value)
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+        if cache is not None:
+            cache.prune(self.order)
+
+        run_info = {
+            "results": results,
+            "executed": executed,
+            "cached": cached,
+        }
+        if profiler is not None:
+            run_info["profile"] = profiler.report()
+        if liveness is not None:
+            run_info["released"] = liveness.released
+        return run_info
+
+    def _run_sequential(self, cache, events, profiler=None, liveness=None, on_value=_ignore_value):
+        results = {}
+        executed = []
+        cached = []
+        for step in self.steps:
+            if cache is not None and step.cacheable:
+                value = cache.get(step.node_id, step.fingerprint)
+                if value is not _MISSING:
+                    results[step.node_id] = value
+                    on_value(step.node_id, value)
+                    cached.append(step.node_id)
+                    if profiler is not None:
+                        profiler.cached(step.node_id)
+                    events({"type": "node_finished", "node": step.node_id, "cached": True, "elapsed": 0.0})
+                    continue
+
+            events({"type": "node_started", "node": step.node_id})
+            start = time.perf_counter()
+            func = step.func if profiler is None else profiler.wrap(step.node_id, step.func)
+            args = step.arguments(results)
+            if liveness is not None:
+                # inputs read for the last time now live only in args, freed when the call returns
+                liveness.consumed(step, results)
+            try:
+                value = func(*args)
+            except Exception as e:
+                events({"type": "node_failed", "node": step.node_id, "error": str(e)})
+                raise
+            events({"type": "node_finished", "node": step.node_id, "cached": False,
+                    "elapsed": time.perf_counter() - start})
+            del args
+            results[step.node_id] = value
+            on_value(step.node_id, value)
+            executed.append(step.node_id)
+            if cache is not None and step.cacheable:
+                cache.put(step.node_id, step.fingerprint, value)
+        return results, executed, cached
+
+    def _run_parallel(self, cache, max_workers, pool, events, profiler=None, liveness=None, on_value=_ignore_value):
+        if pool not in ("thread", "process"):
+            raise ValueError(f"Unknown pool type '{pool}', expected 'thread' or 'process'")
+        if max_workers is None:
+            # the defaults of ProcessPoolExecutor and ThreadPoolExecutor
+            if pool == "process" and profiler is None:
+                max_workers = os.cpu_count() or 1
+            else:
+                max_workers = min(32, (os.cpu_count() or 1) + 4)
+
+        steps = {step.node_id: step for step in self.steps}
+        position = {node_id: index for index, node_id in enumerate(self.order)}
+        dependents = defaultdict(list)
+        waiting = {}
+        for step in self.steps:
+            upstream = step.upstream()
+            waiting[step.node_id] = len(upstream)
+            for from_node in upstream:
+                dependents[from_node].append(step.node_id)
+
+        results = {}
+        executed = []
+        cached = []
+        # captured (stdout, stderr) per finished node, written out in plan order
+        outputs = {}
+        emitted = 0
+        failure = None
+
+        ready = deque(node_id for node_id in self.order if waiting[node_id] == 0)
+        running = {}
+        started = {}
+        # node id -> pool thread running it, so a cancelled run can interrupt the node
+        node_threads = {}
+        interrupted = False
+        local_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="roon-node")
+        remote_pool = None
+        if pool == "process" and profiler is None:
+            # imported here, they pull in multiprocessing
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: the GUI process runs webview, server and job threads
+            remote_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+        def finish(node_id, value, output):
+            results[node_id] = value
+            on_value(node_id, value)
+            outputs[node_id] = output
+            for dependent in dependents[node_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+
+        def flush():
+            nonlocal emitted
+            while emitted < len(self.order) and self.order[emitted] in outputs:
+                stdout_text, stderr_text = outputs.pop(self.order[emitted])
+                if stdout_text:
+                    sys.stdout.write(stdout_text)
+                if stderr_text:
+                    sys.stderr.write(stderr_text)
+                emitted += 1
+
+        try:
+            while ready or running:
+                # both pools hold max_workers threads/processes; cap the nodes in flight across them
+                while ready and failure is None and len(running) < max_workers:
+                    node_id = ready.popleft()
+                    step = steps[node_id]
+                    if cache is not None and step.cacheable:
+                        value = cache.get(node_id, step.fingerprint)
+                        if value is not _MISSING:
+                            cached.append(node_id)
+                            if profiler is not None:
+                                profiler.cached(node_id)
+                            events({"type": "node_finished", "node": node_id, "cached": True, "elapsed": 0.0})
+                            finish(node_id, value, ("", ""))
+                            continue
+                    executor = remote_pool if remote_pool is not None and step.importable else local_pool
+                    events({"type": "node_started", "node": node_id})
+                    started[node_id] = time.perf_counter()
+                    func = step.func if profiler is None else profiler.wrap(node_id, step.func)
+                    if executor is local_pool:
+                        future = executor.submit(_call_in_thread, node_threads, node_id, func, step.arguments(results))
+                    else:
+                        future = executor.submit(_call_captured, func, step.arguments(results))
+                    running[future] = node_id
+                    if liveness is not None:
+                        liveness.consumed(step, results)
+                flush()
+                if not running:
+                    break
+
+                # wake up regularly: a cancellation (JobCancelled raised into this
+                # thread) is only delivered while Python code runs
+                done, _ = wait(running, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: position[running[f]]):
+                    node_id = running.pop(future)
+                    try:
+                        value, stdout_text, stderr_text, error = future.result()
+                    except Exception as e:
+                        # the worker itself failed, e.g. arguments that cannot be pickled
+                        value, stdout_text, stderr_text, error = None, "", "", e
+                    if error is not None:
+                        events({"type": "node_failed", "node": node_id, "error": str(error)})
+                        outputs[node_id] = (stdout_text, stderr_text)
+                        if failure is None:
+                            failure = error
+                        continue
+                    events({"type": "node_finished", "node": node_id, "cached": False,
+                            "elapsed": time.perf_counter() - started[node_id]})
+                    executed.append(node_id)
+                    if cache is not None and steps[node_id].cacheable:
+                        cache.put(node_id, steps[node_id].fingerprint, value)
+                    finish(node_id, value, (stdout_text, stderr_text))
+        except BaseException as e:
+            if isinstance(e, Exception):
+                raise
+            # cancelled job or KeyboardInterrupt: drop queued nodes and stop the
+            # running ones instead of waiting for them in shutdown()
+            interrupted = True
+            for future in running:
+                future.cancel()
+            for thread_id in list(node_threads.values()):
+                jobs.set_async_exc(thread_id, type(e))
+            if remote_pool is not None:
+                for process in list((getattr(remote_pool, "_processes", None) or {}).values()):
+                    process.terminate()
+            raise
+        finally:
+            local_pool.shutdown(wait=not interrupted)
+            if remote_pool is not None:
+                remote_pool.shutdown(wait=not interrupted)
+
+        if failure is not None:
+            # write out whatever finished, still in plan order, then report the first error
+            for node_id in self.order[emitted:]:
+                if node_id in outputs:
+                    stdout_text, stderr_text = outputs.pop(node_id)
+                    sys.stdout.write(stdout_text)
+                    sys.stderr.write(stderr_text)
+            raise failure
+        flush()
+
+        executed.sort(key=position.get)
+        cached.sort(key=position.get)
+        return results, executed, cached
+
+def _ignore_event(event):
+    pass
+
+class _Liveness:
+    """
+    Last-use tracking for Plan.run(release=True).
+
+    Each node output starts with the number of steps reading it; once the
+    last of them has taken its arguments the output is dropped from the
+    results, unless it is pinned.
+    """
+    def __init__(self, consumers, pinned):
+        self.remaining = dict(consumers)
+        self.pinned = set(pinned)
+        self.released = []
+
+    def consumed(self, step, results):
+        for from_node in step.upstream():
+            self.remaining[from_node] -= 1
+            if self.remaining[from_node] == 0 and from_node not in self.pinned:
+                results.pop(from_node, None)
+                self.released.append(from_node)
+
+# seconds between checks for cancellation while parallel nodes run
+_POLL_INTERVAL = 0.1
+
+def _call_in_thread(node_threads, node_id, func, args):
+    node_threads[node_id] = threading.get_ident()
+    try:
+        return _call_captured(func, args)
+    finally:
+        node_threads.pop(node_id, None)
+
+def _call_captured(func, args):
+    """Runs one node with its own stdout/stderr buffers (in a pool thread or worker process)."""
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    with capture.redirect(stdout_buffer, stderr_buffer):
+        try:
+            value = func(*args)
+            error = None
+        except Exception as e:
+            value = None
+            error = e
+    return value, stdout_buffer.getvalue(), stderr_buffer.getvalue(), error
+
+def graph_hash(json_data):
+    """Hash of everything that affects execution (node positions and UI state are ignored)."""
+    nodes = [
+        [
+            node['id'],
+            node.get('module'),
+            node['name'],
+            node.get('source'),
+            [[spec['name'], repr(spec.get('default'))] for spec in node['inputs']],
+            [spec['name'] for spec in node['outputs']],
+            node.get('cache', True),
+        ]
+        for node in json_data['nodes']
+    ]
+    connections = [
+        [conn['from']['node'], conn['from']['output'], conn['to']['node'], conn['to']['input']]
+        for conn in json_data['connections']
+    ]
+    payload = json.dumps([nodes, connections], default=repr)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def compile_plan(json_data, namespace=None):
+    """
+    Turns the graph JSON into a Plan.
+
+    Args:
+        json_data (dict): Graph with 'nodes' and 'connections' (same format as generate_python_script)
+        namespace (dict): Globals used for source-defined nodes (default: fresh dict)
+
+    Returns:
+        Plan: Resolved steps in topological order
+    """
+    nodes = json_data['nodes']
+    connections = json_data['connections']
+    node_dict = {node['id']: node for node in nodes}
+    order = topological_order(nodes, connections)
+    connections_map = build_connections_map(connections)
+    if namespace is None:
+        namespace = {}
+
+    steps = []
+    fingerprints = {}
+    for node_id in order:
+        node = node_dict[node_id]
+
+        # Collect argument bindings and the keys that make up the fingerprint
+        bindings = []
+        input_keys = []
+        for input_spec in node['inputs']:
+            input_name = input_spec['name']
+            if (node_id, input_name) in connections_map:
+                from_node, output_name = connections_map[(node_id, input_name)]
+                if len(node_dict[from_node]['outputs']) == 1:
+                    bindings.append(("link", from_node, None))
+                else:
+                    bindings.append(("link", from_node, output_name))
+                input_keys.append(("link", input_name, fingerprints[from_node], output_name))
+            elif input_spec['default'] is not None:
+                bindings.append(("literal", input_spec['default']))
+                input_keys.append(("literal", input_name, repr(input_spec['default'])))
+            else:
+                raise ValueError(f"Missing required input '{input_name}' for node {node_id}")
+
+        fingerprint = node_fingerprint(node, input_keys)
+        fingerprints[node_id] = fingerprint
+        func = resolve_callable(node, namespace)
+        importable = bool(node.get('module')) and node['module'] != "<source>"
+        steps.append(PlanStep(node_id, func, bindings, is_cacheable(node), fingerprint, importable))
+
+    return Plan(graph_hash(json_data), steps, namespace)
+
+class PlanCache:
+    """Compiled plans keyed by graph hash and namespace, with LRU eviction."""
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, json_data, namespace):
+        key = (graph_hash(json_data), id(namespace))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+        plan = compile_plan(json_data, namespace)
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+plan_cache = PlanCache()
+
+def execute_graph(json_data, namespace=None, cache=None, plans=plan_cache, max_workers=1, pool="thread", events=None,
+                  profiler=None, release=False, pinned=(), on_value=None):
+    """
+    Runs the node graph in-process, reusing the compiled plan and cached node outputs where possible.
+
+    Args:
+        json_data (dict): Graph with 'nodes' and 'connections' (same format as generate_python_script)
+        namespace (dict): Globals used for source-defined nodes; plans are only
+                          cached when a namespace is given (default: fresh dict)
+        cache (ResultCache): Results from previous runs; None disables caching
+        plans (PlanCache): Where compiled plans are looked up; None always recompiles
+        max_workers (int): Independent branches run concurrently when not 1 (see Plan.run)
+        pool (str): "thread" or "process" worker pool for parallel runs
+        events (callable): Receives node_started / node_finished / node_failed events
+        profiler: profiling.NodeProfiler or HotspotProfiler, its report is returned as "profile"
+        release (bool): Free intermediate outputs after their last use (see Plan.run)
+        pinned (iterable): Node ids kept in the results with release=True
+        on_value (callable): Called with (node id, value) as each output becomes available
+
+    Returns:
+        dict: {"results": node id -> return value, "executed": [ids], "cached": [ids]}
+    """
+    if namespace is None or plans is None:
+        plan = compile_plan(json_data, namespace)
+    else:
+        plan = plans.get(json_data, namespace)
+    return plan.run(cache=cache, max_workers=max_workers, pool=pool, events=events, profiler=profiler,
+                    release=release, pinned=pinned, on_value=on_value)
@@ -0,0 +1,175 @@
+import ctypes
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job's thread when it is cancelled.
+
+    Derives from BaseException so that user code catching Exception does not
+    swallow the cancellation.
+    """
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+class Job:
+    def __init__(self, job_id, func, args, kwargs, label="", stream=None):
+        self.id = job_id
+        self.label = label
+        # OutputRing collecting the job's output while it runs (optional)
+        self.stream = stream
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.state = PENDING
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.thread = None
+        self.done_event = threading.Event()
+
+    def status(self):
+        end = self.finished if self.finished is not None else time.time()
+        return {
+            "job_id": self.id,
+            "label": self.label,
+            "state": self.state,
+            "elapsed": (end - self.started) if self.started is not None else 0.0,
+            "error": self.error,
+        }
+
+def set_async_exc(thread_id, exc_type):
+    # Raise exc_type in the given thread at its next bytecode; None clears a pending one
+    exc = ctypes.py_object(exc_type) if exc_type is not None else None
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exc)
+
+class JobManager:
+    """
+    Runs callables on background threads and tracks them by job id.
+
+    Every job gets its own daemon thread, so several graph runs or REPL
+    snippets can be in flight at once while the caller (the pywebview bridge)
+    returns immediately. Cancelling a running job raises JobCancelled in its
+    thread; this takes effect at the next Python bytecode, so a job blocked
+    inside a long C call stops once that call returns. Parallel graph runs
+    pass the cancellation on to the nodes running in their worker pool.
+    """
+    def __init__(self, max_finished=100):
+        self.max_finished = max_finished
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, label="", stream=None, **kwargs):
+        """
+        Starts func(*args, **kwargs) on a new thread.
+
+        Args:
+            label (str): Short description reported by status
+            stream (OutputRing): Where the job writes its output, read back with output()
+
+        Returns:
+            str: Id used with status, result and cancel
+        """
+        with self._lock:
+            job_id = str(next(self._ids))
+            job = Job(job_id, func, args, kwargs, label=label, stream=stream)
+            self._jobs[job_id] = job
+            self._evict_finished()
+        job.thread = threading.Thread(target=self._run, args=(job,), name=f"roon-job-{job_id}", daemon=True)
+        job.thread.start()
+        return job_id
+
+    def _run(self, job):
+        with self._lock:
+            if job.state != PENDING:
+                job.done_event.set()
+                return
+            job.state = RUNNING
+            job.started = time.time()
+        try:
+            try:
+                job.result = job.func(*job.args, **job.kwargs)
+                state = DONE
+            except JobCancelled:
+                state = CANCELLED
+            except Exception as e:
+                job.error = str(e)
+                state = FAILED
+            with self._lock:
+                # cancel() can no longer target this job; drop a cancellation that arrived too late
+                set_async_exc(job.thread.ident, None)
+                job.state = state
+                job.finished = time.time()
+        except JobCancelled:
+            with self._lock:
+                job.state = CANCELLED
+                job.finished = time.time()
+        job.done_event.set()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.state in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _get(self, job_id):
+        job = self._jobs.get(str(job_id))
+        if job is None:
+            raise KeyError(f"Unknown job '{job_id}'")
+        return job
+
+    def status(self, job_id):
+        return self._get(job_id).status()
+
+    def result(self, job_id, timeout=0):
+        """
+        Status of the job plus its return value once it has finished.
+
+        Args:
+            job_id (str): Id returned by submit
+            timeout (float): Seconds to wait for the job to finish (0 returns immediately)
+        """
+        job = self._get(job_id)
+        if timeout:
+            job.done_event.wait(timeout)
+        status = job.status()
+        status["result"] = job.result if job.state == DONE else None
+        return status
+
+    def output(self, job_id, since=0, timeout=0):
+        """Output chunks and events of the job after sequence number since (see OutputRing.read)."""
+        job = self._get(job_id)
+        if job.stream is None:
+            return {"chunks": [], "next": since, "dropped": 0, "closed": job.state in FINISHED_STATES}
+        return job.stream.read(since, timeout)
+
+    def cancel(self, job_id):
+        """
+        Stops a pending or running job.
+
+        Returns:
+            bool: False if the job had already finished
+        """
+        job = self._get(job_id)
+        with self._lock:
+            if job.state in FINISHED_STATES:
+                return False
+            if job.state == PENDING:
+                job.state = CANCELLED
+                job.finished = time.time()
+                return True
+            set_async_exc(job.thread.ident, JobCancelled)
+        return True
+
+    def list(self):
+        with self._lock:
+            return [job.status() for job in self._jobs.values()]
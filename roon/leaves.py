@@ -0,0 +1,37 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+from roon import binning
+
+# Helpers for the leaf plotting nodes in builtin_basic / static/nodes/basic.py;
+# kept out of the node modules so they do not show up as nodes.
+
+def flat_leaf(values):
+    """Jagged (per-track) and flat leaves alike as one flat numpy array."""
+    # imported on use: loading the node module (e.g. for the catalog) stays cheap
+    import awkward as ak
+    return ak.to_numpy(ak.flatten(values, axis=None))
+
+def plot_leaf(all_leaf, leaf_name, nbins=-1, range=None):
+    """Histogram of a flat leaf, with automatic binning when nbins is -1 and a log y axis for wide ranges."""
+    if nbins == -1:
+        # range from the binning too, so integer bins are centred on the values
+        nbins, low, high = binning.choose_binning(all_leaf)
+        if range is None:
+            range = (low, high)
+    plt.hist(all_leaf, bins=nbins, range=range)
+    plt.xlabel(leaf_name)
+    plt.ylabel("Counts")
+    plt.title(leaf_name)
+
+    # set log y if difference between max and min is large
+    if len(all_leaf) and np.max(all_leaf) / max(np.min(all_leaf), 0.01) > 100:
+        plt.yscale('log')
+
+    plt.show()
+
+def leaf_names(leafs):
+    """Leaf names from a list of names, or from a branch/tree (anything with keys())."""
+    if hasattr(leafs, "keys"):
+        leafs = leafs.keys()
+    return list(leafs)
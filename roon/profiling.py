@@ -0,0 +1,418 @@
+import os
+import re
+import sys
+import json
+import time
+import threading
+import tracemalloc
+
+def output_size(value, depth=2):
+    """
+    Approximate size in bytes of a node output.
+
+    Arrays report their buffer size (nbytes); containers add up their items
+    down to depth levels, so huge nested structures are not walked in full.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if depth > 0:
+        if isinstance(value, dict):
+            size += sum(output_size(key, depth - 1) + output_size(item, depth - 1) for key, item in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(output_size(item, depth - 1) for item in value)
+    return size
+
+class NodeProfiler:
+    """
+    Per-node wall time, CPU time, peak traced memory and output size of one run.
+
+    Nodes are wrapped with wrap() before they run; the measurements are taken
+    on the thread executing the node, so CPU time is the node's own thread
+    time. Peak memory comes from tracemalloc (started for the run if it is not
+    already tracing) and is the peak above the memory in use when the node
+    started. With parallel runs the tracemalloc peak is process wide, so
+    nodes running at the same time see each other's allocations.
+    """
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = {}
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.origin = time.perf_counter()
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def wrap(self, node_id, func):
+        """func, instrumented to record a profile entry for node_id when called."""
+        label = getattr(func, "__name__", str(func))
+
+        def profiled(*args):
+            if self.memory and tracemalloc.is_tracing():
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            else:
+                baseline = None
+            start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                value = func(*args)
+            finally:
+                cpu = time.thread_time() - cpu_start
+                end = time.perf_counter()
+                peak = tracemalloc.get_traced_memory()[1] - baseline if baseline is not None else None
+                self._record(node_id, {
+                    "name": label,
+                    "wall": end - start,
+                    "cpu": cpu,
+                    "peak_memory": max(peak, 0) if peak is not None else None,
+                    "start": start - self.origin,
+                    "end": end - self.origin,
+                    "thread": threading.get_ident(),
+                    "cached": False,
+                    "output_bytes": None,
+                })
+            size = output_size(value)
+            with self._lock:
+                self.records[node_id]["output_bytes"] = size
+            return value
+        return profiled
+
+    def cached(self, node_id):
+        now = time.perf_counter() - self.origin
+        self._record(node_id, {"name": None, "wall": 0.0, "cpu": 0.0, "peak_memory": 0, "output_bytes": None,
+                               "start": now, "end": now, "thread": threading.get_ident(), "cached": True})
+
+    def _record(self, node_id, record):
+        with self._lock:
+            self.records[node_id] = record
+
+    def report(self):
+        """
+        Returns:
+            dict: str(node id) -> {"name", "wall", "cpu", "peak_memory", "output_bytes", "start", "end", "cached"}
+        """
+        with self._lock:
+            return {
+                str(node_id): {key: value for key, value in record.items() if key != "thread"}
+                for node_id, record in self.records.items()
+            }
+
+    def chrome_trace(self):
+        """Timeline in Chrome trace event format, loadable in chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        with self._lock:
+            records = list(self.records.items())
+        threads = {}
+        events = []
+        for node_id, record in records:
+            if record["cached"]:
+                continue
+            tid = threads.setdefault(record["thread"], len(threads) + 1)
+            events.append({
+                "name": f"{record['name']} [{node_id}]",
+                "cat": "node",
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall"] * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": {
+                    "node": str(node_id),
+                    "cpu_ms": record["cpu"] * 1e3,
+                    "peak_memory": record["peak_memory"],
+                    "output_bytes": record.get("output_bytes"),
+                },
+            })
+        for thread, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": f"worker {tid}"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def format(self):
+        """Plain-text table of the executed nodes, slowest first."""
+        rows = sorted((record for record in self.report().items() if not record[1]["cached"]),
+                      key=lambda item: item[1]["wall"], reverse=True)
+        lines = [f"{'node':<28}{'wall ms':>10}{'cpu ms':>10}{'peak MB':>10}{'output MB':>11}"]
+        for node_id, record in rows:
+            peak = record["peak_memory"]
+            output = record["output_bytes"]
+            lines.append(
+                f"{(record['name'] + ' [' + node_id + ']')[:27]:<28}{record['wall'] * 1e3:10.1f}{record['cpu'] * 1e3:10.1f}"
+                f"{(peak / 1e6 if peak is not None else float('nan')):10.2f}"
+                f"{(output / 1e6 if output is not None else float('nan')):11.2f}"
+            )
+        return "\n".join(lines)
+
+# generated scripts assign node outputs to node_<id>_<output> / node_<id>_result
+_NODE_ASSIGNMENT = re.compile(r"^\s*node_(\w+?)_(?:result|\w+)\s*=")
+
+def script_line_labels(code):
+    """Line number -> "node <id>" for the node calls in a script from generate_python_script."""
+    labels = {}
+    for lineno, line in enumerate(code.splitlines(), start=1):
+        match = _NODE_ASSIGNMENT.match(line)
+        if match is not None:
+            labels[lineno] = f"node {match.group(1)}"
+    return labels
+
+def _frame_name(code):
+    # ';' separates frames in the collapsed format, keep it out of the names
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+class HotspotProfiler:
+    """
+    Function-level hotspots of a graph run or script, attributed to node ids.
+
+    mode "deterministic" runs every node under cProfile: exact call counts and
+    self/total times per function, with flat node;function stacks. cProfile
+    can only profile one thread at a time, so graphs run sequentially in this
+    mode. mode "sampling" records the stacks of the threads executing nodes
+    every interval seconds from a background thread: lower overhead, works
+    with parallel runs and gives full stacks for flamegraphs, but times are
+    estimates from sample counts. For scripts (run_script) both modes
+    attribute time to the node whose line of the script is running.
+    """
+    def __init__(self, mode="deterministic", interval=0.005):
+        if mode not in ("deterministic", "sampling"):
+            raise ValueError(f"Unknown profiling mode '{mode}', expected 'deterministic' or 'sampling'")
+        self.mode = mode
+        self.interval = interval
+        self.sequential = mode == "deterministic"
+        self._lock = threading.Lock()
+        # deterministic: (label, cProfile.Profile) per profiled call
+        self._profiles = []
+        # sampling: thread ident -> (root code object, label or line -> label map)
+        self._active = {}
+        self._stacks = {}
+        self._sampler = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        if self.mode == "sampling" and self._sampler is None:
+            self._stopping.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="roon-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        if self._sampler is not None:
+            self._stopping.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def wrap(self, node_id, func):
+        """func, run under the profiler with its frames attributed to node_id."""
+        label = f"node {node_id} ({getattr(func, '__name__', func)})".replace(";", ":")
+
+        def profiled(*args):
+            return self._profile(label, None, func, args)
+        return profiled
+
+    def cached(self, node_id):
+        pass
+
+    def run_script(self, code, compiled, func):
+        """
+        Call func(), which executes the compiled script code, under the profiler.
+
+        Frames below a line of a generated script that assigns a node output
+        are attributed to that node, everything else to "<script>".
+        """
+        script = (compiled, script_line_labels(code))
+        if self.mode == "deterministic":
+            return self._profile_script(script, func)
+        return self._profile("<script>", script, func, ())
+
+    def _profile_script(self, script, func):
+        # cProfile only knows functions, not script lines: a line tracer on the
+        # script's own frame switches to the profile of the node whose line runs
+        import cProfile
+        compiled, labels = script
+        profiles = {}
+        current = None
+
+        def switch(label):
+            nonlocal current
+            if current is not None:
+                current.disable()
+            current = profiles.get(label)
+            if current is None:
+                current = profiles[label] = cProfile.Profile()
+            current.enable()
+
+        def trace_lines(frame, event, arg):
+            if event == "line":
+                switch(labels.get(frame.f_lineno, "<script>"))
+            return trace_lines
+
+        def trace_calls(frame, event, arg):
+            return trace_lines if frame.f_code is compiled else None
+
+        previous = sys.gettrace()
+        sys.settrace(trace_calls)
+        try:
+            return func()
+        finally:
+            sys.settrace(previous)
+            if current is not None:
+                current.disable()
+            with self._lock:
+                self._profiles.extend(profiles.items())
+
+    def _profile(self, label, script, func, args):
+        if self.mode == "deterministic":
+            import cProfile
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return func(*args)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append((label, profile))
+
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = (label, script)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active.pop(ident, None)
+
+    def _sample_loop(self):
+        last = time.perf_counter()
+        while not self._stopping.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            with self._lock:
+                active = dict(self._active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for ident, (label, script) in active.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._record_sample(self._stack(frame, label, script), elapsed)
+
+    def _stack(self, frame, label, script):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            if script is not None and code is script[0]:
+                label = script[1].get(frame.f_lineno, "<script>")
+                break
+            if script is None and code is _PROFILE_CODE:
+                break
+            names.append(_frame_name(code))
+            frame = frame.f_back
+        names.append(label)
+        return tuple(reversed(names))
+
+    def _record_sample(self, stack, seconds):
+        with self._lock:
+            self._stacks[stack] = self._stacks.get(stack, 0.0) + seconds
+
+    def hotspots(self, limit=30):
+        """
+        Functions sorted by self time.
+
+        Returns:
+            list: {"node", "function", "calls", "self", "total"} rows; calls is
+                  None in sampling mode, times are in seconds
+        """
+        rows = {}
+        if self.mode == "deterministic":
+            import pstats
+            with self._lock:
+                profiles = list(self._profiles)
+            for label, profile in profiles:
+                for (filename, line, name), (_, calls, self_time, total, _) in pstats.Stats(profile).stats.items():
+                    if "_lsprof.Profiler" in name or name == "<built-in method sys.settrace>":
+                        # the profiler's own disable() call, and removing the script line tracer
+                        continue
+                    function = f"{name} ({os.path.basename(filename)}:{line})"
+                    row = rows.setdefault((label, function), {"node": label, "function": function,
+                                                              "calls": 0, "self": 0.0, "total": 0.0})
+                    row["calls"] += calls
+                    row["self"] += self_time
+                    row["total"] += total
+        else:
+            with self._lock:
+                stacks = dict(self._stacks)
+            for stack, seconds in stacks.items():
+                label = stack[0]
+                for depth, function in enumerate(stack[1:], start=1):
+                    row = rows.setdefault((label, function), {"node": label, "function": function,
+                                                              "calls": None, "self": 0.0, "total": 0.0})
+                    if function not in stack[1:depth]:
+                        # count recursive frames once per sample
+                        row["total"] += seconds
+                    if depth == len(stack) - 1:
+                        row["self"] += seconds
+        return sorted(rows.values(), key=lambda row: row["self"], reverse=True)[:limit]
+
+    def collapsed(self):
+        """Stacks in the collapsed format of flamegraph.pl / speedscope, weights in microseconds."""
+        lines = []
+        if self.mode == "deterministic":
+            for row in self.hotspots(limit=None):
+                if row["self"] > 0:
+                    lines.append(f"{row['node']};{row['function'].replace(';', ':')} {int(row['self'] * 1e6)}")
+        else:
+            with self._lock:
+                stacks = dict(self._stacks)
+            for stack, seconds in sorted(stacks.items()):
+                lines.append(f"{';'.join(stack)} {int(seconds * 1e6)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def save_collapsed(self, path):
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+        return path
+
+    def report(self, limit=30):
+        return {"mode": self.mode, "hotspots": self.hotspots(limit), "collapsed": self.collapsed()}
+
+    def format(self, limit=30):
+        """Plain-text hotspot table."""
+        lines = [f"{'node':<24}{'function':<48}{'calls':>8}{'self ms':>10}{'total ms':>10}"]
+        for row in self.hotspots(limit):
+            calls = "" if row["calls"] is None else str(row["calls"])
+            lines.append(f"{row['node'][:23]:<24}{row['function'][:47]:<48}{calls:>8}"
+                         f"{row['self'] * 1e3:10.1f}{row['total'] * 1e3:10.1f}")
+        return "\n".join(lines)
+
+# frames from here on up belong to the profiler, not to the node
+_PROFILE_CODE = HotspotProfiler._profile.__code__
+
+def make_profiler(kind):
+    """
+    Profiler for a profile option value.
+
+    Args:
+        kind: None/False for no profiling, True or "nodes" for NodeProfiler,
+              "deterministic" (alias "cprofile") or "sampling" for HotspotProfiler
+    """
+    if not kind:
+        return None
+    if kind is True or kind == "nodes":
+        return NodeProfiler()
+    if kind == "cprofile":
+        kind = "deterministic"
+    return HotspotProfiler(kind)
@@ -0,0 +1,125 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+class _OpenFile:
+    __slots__ = ("stamp", "file", "trees")
+
+    def __init__(self, stamp, file):
+        self.stamp = stamp
+        self.file = file
+        # tree name -> TTree, so the TTree metadata (branches, baskets) is parsed once
+        self.trees = {}
+
+def _close_when_unreferenced(directory):
+    # node outputs cached by the engine (the directory, trees, branches) may
+    # still use the file; its handles are closed once the last of them is gone
+    file = getattr(directory, "file", directory)
+    source = getattr(file, "source", None)
+    if source is not None:
+        weakref.finalize(file, source.close)
+
+class FilePool:
+    """
+    Process-wide pool of open ROOT files shared by all nodes and graph runs.
+
+    Files are keyed by absolute path and reopened only when their mtime or
+    size changes. At most max_open files are kept; the least recently used
+    one is dropped from the pool but not closed right away, since node
+    outputs cached by the engine may still reference it. Its file handles
+    are closed as soon as nothing does, so max_open bounds the open handles
+    except for files still in use.
+
+    object_cache and array_cache are passed to uproot.open (number of parsed
+    objects, and decompressed array bytes such as "100 MB" respectively), so
+    repeated reads of the same branches skip decompression.
+    """
+    def __init__(self, max_open=16, object_cache=100, array_cache="100 MB"):
+        self.max_open = max_open
+        self.object_cache = object_cache
+        self.array_cache = array_cache
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_open=None, object_cache=None, array_cache=None):
+        """Change the limits; cache sizes apply to files opened from now on."""
+        with self._lock:
+            if max_open is not None:
+                self.max_open = max_open
+            if object_cache is not None:
+                self.object_cache = object_cache
+            if array_cache is not None:
+                self.array_cache = array_cache
+            self._evict()
+
+    def _entry(self, path):
+        import uproot
+        path = os.path.abspath(os.path.expanduser(path))
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry.stamp == stamp:
+                self._files.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # open outside the lock, reading the header can be slow on network filesystems
+        file = uproot.open(path, object_cache=self.object_cache, array_cache=self.array_cache)
+        entry = _OpenFile(stamp, file)
+        with self._lock:
+            previous = self._files.get(path)
+            if previous is not None:
+                # the file changed on disk; the old version is retired like an evicted one
+                _close_when_unreferenced(previous.file)
+            self._files[path] = entry
+            self._files.move_to_end(path)
+            self._evict()
+        return entry
+
+    def _evict(self):
+        while len(self._files) > self.max_open:
+            _, entry = self._files.popitem(last=False)
+            _close_when_unreferenced(entry.file)
+
+    def open(self, path):
+        """The uproot file for path, shared with every other caller."""
+        return self._entry(path).file
+
+    def tree(self, path, tree_name):
+        """The TTree tree_name in path, parsed once per file version."""
+        entry = self._entry(path)
+        with self._lock:
+            tree = entry.trees.get(tree_name)
+        if tree is None:
+            tree = entry.file[tree_name]
+            with self._lock:
+                tree = entry.trees.setdefault(tree_name, tree)
+        return tree
+
+    def clear(self):
+        with self._lock:
+            for entry in self._files.values():
+                _close_when_unreferenced(entry.file)
+            self._files.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "open": list(self._files),
+                "max_open": self.max_open,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+pool = FilePool()
+
+def open_file(path):
+    return pool.open(path)
+
+def get_tree(path, tree_name):
+    return pool.tree(path, tree_name)
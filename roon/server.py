@@ -0,0 +1,241 @@
+import os
+import re
+import gzip
+import hashlib
+import threading
+import mimetypes
+import http.server
+import importlib.resources as resources
+from urllib.parse import urlsplit, parse_qs, unquote
+
+DEFAULT_PORT = 8000
+
+# only text-like assets are worth compressing
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+_MIN_COMPRESS_SIZE = 1024
+
+# Global server reference for clean shutdown
+httpd = None
+
+# URL prefix -> callable(handler, url) for dynamic endpoints next to the static files
+routes = {}
+
+def register_route(prefix, func):
+    """Serve every GET/HEAD request whose path starts with prefix by calling func(handler, url)."""
+    routes[prefix] = func
+
+def base_url():
+    """URL of the running server, or None if it is not running."""
+    if httpd is None:
+        return None
+    return f"http://127.0.0.1:{httpd.server_address[1]}"
+
+def find_static_dir():
+    """Location of the built Svelte app, installed package first, then the source tree."""
+    try:
+        with resources.path("roon.static", "svelte") as svelte_path:
+            svelte_build_dir = str(svelte_path)
+
+        if not os.path.exists(svelte_build_dir):
+            raise FileNotFoundError(f"Svelte build directory not found: {svelte_build_dir}")
+    except Exception as e:
+        print(f"Error finding Svelte build directory: {e}")
+        svelte_build_dir = os.path.abspath("./roon/static/svelte")  # Adjust path as needed
+    return svelte_build_dir
+
+def _stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+class Asset:
+    __slots__ = ("data", "gzipped", "etag", "content_type", "stamp", "links")
+
+    def __init__(self, data, content_type, stamp, links=()):
+        self.data = data
+        self.content_type = content_type
+        self.stamp = stamp
+        # (path, stamp) of the assets an HTML page references by version
+        self.links = tuple(links)
+        self.etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+        self.gzipped = None
+        if content_type.startswith(_COMPRESSIBLE) and len(data) >= _MIN_COMPRESS_SIZE:
+            self.gzipped = gzip.compress(data, compresslevel=6)
+
+class AssetCache:
+    """
+    Static files held in memory with their gzip encoding and content hash.
+
+    Files are read and compressed once and reloaded when their mtime or size
+    changes, so a rebuilt bundle is picked up without restarting. index.html is
+    rewritten to reference local assets as /path?v=<hash> and is rewritten
+    again when one of those assets changes; the versioned URLs can be cached
+    by the webview indefinitely, everything else is revalidated with the ETag.
+    """
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url_path):
+        """Filesystem path for a URL path, or None if it escapes the directory or does not exist."""
+        relative = os.path.normpath(url_path.lstrip("/")) if url_path.strip("/") else "index.html"
+        path = os.path.abspath(os.path.join(self.directory, relative))
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if not path.startswith(self.directory + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def _fresh(self, asset, stamp):
+        if asset is None or asset.stamp != stamp:
+            return False
+        try:
+            return all(_stamp(link) == link_stamp for link, link_stamp in asset.links)
+        except OSError:
+            return False
+
+    def get(self, path):
+        stamp = _stamp(path)
+        with self._lock:
+            asset = self._assets.get(path)
+        if self._fresh(asset, stamp):
+            return asset
+
+        with open(path, "rb") as f:
+            data = f.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if path.endswith(".map"):
+            content_type = "application/json"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+        links = []
+        if path.endswith(".html"):
+            data = self._version_links(data, links)
+        asset = Asset(data, content_type, stamp, links)
+        with self._lock:
+            self._assets[path] = asset
+        return asset
+
+    def version(self, url_path):
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        return self.get(path).etag.strip('"')[:8]
+
+    def _version_links(self, html, links):
+        def replace(match):
+            url = match.group(2)
+            path = self.resolve(url)
+            if path is None:
+                return match.group(0)
+            asset = self.get(path)
+            links.append((path, asset.stamp))
+            version = asset.etag.strip('"')[:8]
+            return f"{match.group(1)}{url}?v={version}{match.group(3)}"
+        text = html.decode("utf-8")
+        text = re.sub(r"""((?:src|href)=['"])(/[^'"?#]+)(['"])""", replace, text)
+        return text.encode("utf-8")
+
+    def warm(self, *url_paths):
+        """Load and compress the given assets ahead of the first request."""
+        for url_path in url_paths:
+            path = self.resolve(url_path)
+            if path is not None:
+                self.get(path)
+
+class StaticRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves files from an AssetCache with gzip, ETag and Cache-Control headers."""
+    assets = None
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _serve(self, head):
+        url = urlsplit(self.path)
+        for prefix, func in routes.items():
+            if url.path.startswith(prefix):
+                func(self, url)
+                return
+        path = self.assets.resolve(unquote(url.path))
+        if path is None:
+            self.send_error(404, "File not found")
+            return
+        asset = self.assets.get(path)
+
+        versioned = parse_qs(url.query).get("v", [None])[0]
+        if versioned is not None and asset.etag.strip('"').startswith(versioned):
+            cache_control = "public, max-age=31536000, immutable"
+        else:
+            cache_control = "no-cache"
+
+        if self.headers.get("If-None-Match") == asset.etag:
+            self.send_response(304)
+            self.send_header("ETag", asset.etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return
+
+        body = asset.data
+        use_gzip = asset.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            body = asset.gzipped
+
+        self.send_response(200)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", cache_control)
+        if asset.gzipped is not None:
+            self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+class RoonHTTPServer(http.server.ThreadingHTTPServer):
+    allow_reuse_address = True  # Enable port reuse
+    daemon_threads = True
+
+def start_server(port=None, directory=None, host="127.0.0.1"):
+    """
+    Start a threaded HTTP server for the Svelte static files.
+
+    Args:
+        port (int): Port to listen on (default: $ROON_PORT or 8000; 0 picks a free port)
+        directory (str): Directory to serve (default: the packaged Svelte build)
+        host (str): Interface to bind, local only by default
+
+    Returns:
+        str: URL of the running server
+    """
+    global httpd
+
+    if port is None:
+        port = int(os.environ.get("ROON_PORT", DEFAULT_PORT))
+    if directory is None:
+        directory = find_static_dir()
+
+    assets = AssetCache(directory)
+    handler = type("Handler", (StaticRequestHandler,), {"assets": assets})
+    httpd = RoonHTTPServer((host, port), handler)
+
+    # Run server in a separate thread
+    server_thread = threading.Thread(target=httpd.serve_forever, name="roon-http", daemon=True)
+    server_thread.start()
+    # compress the bundle while the window is being created
+    threading.Thread(target=assets.warm, args=("/", "/build/bundle.js", "/build/bundle.css"),
+                     name="roon-http-warm", daemon=True).start()
+    url_host = host if host not in ("", "0.0.0.0") else "localhost"
+    return f"http://{url_host}:{httpd.server_address[1]}"
+
+def stop_server():
+    global httpd
+    if httpd:
+        print("Shutting down server...")
+        httpd.shutdown()
+        httpd.server_close()
+        httpd = None
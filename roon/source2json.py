@@ -6,6 +6,8 @@ import textwrap
 import types
 from typing import get_type_hints, Tuple, Dict, get_origin, get_args
 
+import roon.ast2json as ast2json
+
 def format_type(type_obj):
     """Convert type objects to clean string representations."""
     if type_obj is None or type_obj == inspect._empty:
@@ -23,7 +25,7 @@ def format_type(type_obj):
             return f"list[{format_type(args[0])}]"
     return str(type_obj).replace("<class '", "").replace("'>", "")
 
-def analyze_source_code_functions(source_code, output_dir="", module_name="<string>"):
+def analyze_source_code_functions(source_code, output_dir="", module_name="<string>", static=False):
     """
     Analyzes functions in a Python source code string and generates JSON representations.
     
@@ -31,10 +33,14 @@ def analyze_source_code_functions(source_code, output_dir="", module_name="<stri
         source_code (str): String containing Python source code
         output_dir (str): Directory where JSON files will be saved (default: current dir)
         module_name (str): Identifier for the source code in JSON output (default: "<string>")
+        static (bool): Only parse the source (roon.ast2json) instead of executing it
     
     Returns:
         dict: Mapping of function names to their JSON file paths or JSON strings
     """
+    if static:
+        return ast2json.analyze_source(source_code, output_dir, module_name)
+
     # Parse the source code into an AST
     tree = ast.parse(source_code)
     lines = source_code.splitlines()
@@ -1,7 +1,7 @@
-import uproot
-import numpy as np
 import matplotlib.pyplot as plt
-import awkward as ak
+
+from roon import binning, leaves
+from roon.accumulators import Histogram
 
 # Open the file and get the tree
 # file = uproot.open("pythia_for_full_sim.picoDst.root")
@@ -14,29 +14,24 @@ def gen_get( fromObj:any, key:any) -> any:
     return fromObj[key]
 
 def plot_from_tree( branch:any, leaf_name:str, nbins:int=-1, range:tuple[float,float]=None):
-    leaf = branch.arrays( [leaf_name], library="ak")
-    all_leaf = ak.flatten(leaf[leaf_name]).to_numpy()
-    calcnbins = smartBinning(all_leaf)
-    if nbins == -1:
-        nbins = calcnbins
-    plt.hist( all_leaf , bins=nbins, range=range)
-    plt.xlabel(leaf_name)
-    plt.ylabel("Counts")
-    plt.title(leaf_name)
+    # an already filled Histogram (e.g. merged over many files) is drawn as is
+    if isinstance(branch, Histogram):
+        branch.plot(histtype="bar")
+        plt.xlabel(leaf_name)
+        plt.ylabel("Counts")
+        plt.title(leaf_name)
+        plt.show()
+        return
 
-    # set log y if difference between max and min is large
-    
-    if np.max(all_leaf) / max( np.min(all_leaf), 0.01 ) > 100:
-        plt.yscale('log')
-
-    plt.show()
+    leaf = branch.arrays( [leaf_name], library="ak")
+    leaves.plot_leaf( leaves.flat_leaf(leaf[leaf_name]), leaf_name, nbins, range)
 
 def filterLeaves( leafs:any, filter:str) -> any:
-    leafs = [ x for x in leafs if filter in x]
+    leafs = [ x for x in leaves.leaf_names(leafs) if filter in x]
     return leafs
 
 def excludeFilter( leafs:any, filter:str) -> any:
-    leafs = [ x for x in leafs if filter not in x]
+    leafs = [ x for x in leaves.leaf_names(leafs) if filter not in x]
     return leafs
 
 # leafs = filterLeaves( fwdTracks.keys(), "FwdTracks")
@@ -44,22 +39,23 @@ def excludeFilter( leafs:any, filter:str) -> any:
 # print(leafs)
 
 def smartBinning( array, reduced=10. ) -> int:
-    # if all values are integers then return the number of unique values
-    if np.all( array == np.round(array) ):
-        # something weird happening with types
-        minmax = int(np.max(array)) - int(np.min(array))
-        minmax = minmax + 1
-        lenb = len( np.unique(array) )
-        
-        n = max(minmax, lenb );
-        n = max( n, 500 ) #dont allow more than 500 bins
-        return 
-        # return len( np.unique(array) )
-    return len( np.unique(array) / reduced )  
+    # one bin per value for integer data, otherwise Freedman-Diaconis from a
+    # sampled quantile sketch (see roon.binning); no full sort or np.unique
+    nbins, low, high = binning.choose_binning(array)
+    if not binning.is_integer_valued(array):
+        # no more bins than (estimated) distinct values / reduced
+        nbins = max( 1, min( nbins, int( binning.approx_distinct(array) / reduced ) ) )
+    return nbins
 
 def plot_foreach( branch:any, leafs:any, range:any=None):
+    # read every leaf in one arrays() call: each basket is decompressed once
+    # instead of once per plot
+    leafs = list( dict.fromkeys( leaves.leaf_names(leafs) ) )
+    if not leafs:
+        return
+    arrays = branch.arrays( leafs, library="ak")
     for leaf in leafs:
-        plot_from_tree( branch, leaf, range=range)
+        leaves.plot_leaf( leaves.flat_leaf(arrays[leaf]), leaf, range=range)
 
 # for leaf in leafs:
 #     plot_from_tree( fwdTracks, leaf, range=None)
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import deque
+
+# nominal size charged for an event so that events also count towards max_bytes
+_EVENT_SIZE = 64
+
+class OutputRing:
+    """
+    Bounded buffer of output chunks and progress events.
+
+    Every chunk gets an increasing sequence number so readers can ask for
+    everything after the last chunk they saw. Once the retained text exceeds
+    max_bytes the oldest chunks are dropped, so a chatty loop cannot grow
+    memory without bound; readers that fell behind are told how many chunks
+    they missed.
+    """
+    def __init__(self, max_bytes=1 << 20):
+        self.max_bytes = max_bytes
+        self.closed = False
+        self._chunks = deque()
+        self._size = 0
+        self._next_seq = 1
+        self._dropped_bytes = {"stdout": 0, "stderr": 0}
+        self._writers = []
+        self._cond = threading.Condition()
+
+    def _append(self, chunk, size):
+        with self._cond:
+            chunk["seq"] = self._next_seq
+            self._next_seq += 1
+            self._chunks.append(chunk)
+            self._size += size
+            while self._size > self.max_bytes and len(self._chunks) > 1:
+                old = self._chunks.popleft()
+                if "text" in old:
+                    self._size -= len(old["text"])
+                    self._dropped_bytes[old["stream"]] += len(old["text"])
+                else:
+                    self._size -= _EVENT_SIZE
+            self._cond.notify_all()
+            return chunk["seq"]
+
+    def write(self, stream, text):
+        if not text:
+            return None
+        return self._append({"stream": stream, "text": text, "time": time.time()}, len(text))
+
+    def event(self, event):
+        """Record a progress event (e.g. the engine's node_started / node_finished)."""
+        return self._append({"stream": "event", "event": event, "time": time.time()}, _EVENT_SIZE)
+
+    def writer(self, stream, chunk_size=4096, interval=0.1):
+        """File-like object appending to this ring (see ChunkedWriter)."""
+        writer = ChunkedWriter(self, stream, chunk_size=chunk_size, interval=interval)
+        with self._cond:
+            self._writers.append(writer)
+        return writer
+
+    def close(self):
+        for writer in self._writers:
+            writer.flush()
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def read(self, since=0, timeout=0):
+        """
+        Chunks with a sequence number greater than since.
+
+        Args:
+            since (int): Last sequence number already seen by the caller
+            timeout (float): Seconds to wait for new chunks when there are none yet
+
+        Returns:
+            dict: {"chunks": [...], "next": last seq returned, "dropped": chunks
+                  evicted before they could be read, "closed": bool}
+        """
+        # hand over text still sitting in the writers' buffers
+        for writer in list(self._writers):
+            writer.flush()
+        with self._cond:
+            if timeout and not self.closed and self._next_seq - 1 <= since:
+                self._cond.wait(timeout)
+            chunks = [chunk for chunk in self._chunks if chunk["seq"] > since]
+            first = self._chunks[0]["seq"] if self._chunks else self._next_seq
+            return {
+                "chunks": chunks,
+                "next": chunks[-1]["seq"] if chunks else max(since, self._next_seq - 1),
+                "dropped": max(0, first - since - 1),
+                "closed": self.closed and not chunks,
+            }
+
+    def text(self, stream):
+        """Retained text of one stream, marking how much was dropped from the front."""
+        with self._cond:
+            text = "".join(chunk["text"] for chunk in self._chunks if chunk["stream"] == stream)
+            dropped = self._dropped_bytes[stream]
+        if dropped:
+            text = f"[... {dropped} characters of earlier {stream} dropped ...]\n" + text
+        return text
+
+class ChunkedWriter:
+    """
+    Stream for sys.stdout / sys.stderr redirection that coalesces writes.
+
+    Text is handed to the ring once chunk_size characters have accumulated,
+    or at a line break when at least interval seconds have passed since the
+    previous chunk, so a tight print loop produces a few large chunks rather
+    than one per call.
+    """
+    def __init__(self, ring, stream, chunk_size=4096, interval=0.1):
+        self.ring = ring
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self._buffer = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            due = self._buffered >= self.chunk_size or (
+                "\n" in text and time.monotonic() - self._last_flush >= self.interval
+            )
+        if due:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            text = "".join(self._buffer)
+            self._buffer = []
+            self._buffered = 0
+            self._last_flush = time.monotonic()
+            # still under the lock: a concurrent flush (OutputRing.read on the
+            # pusher thread) must not append its chunk ahead of this one
+            self.ring.write(self.stream, text)
+
+    def isatty(self):
+        return False
+
+class Pusher:
+    """
+    Background thread forwarding new ring contents to a callback.
+
+    Used to push job output into the webview with window.evaluate_js while
+    the job is still running; send(key, data) receives what OutputRing.read
+    returned. A ring stops being watched once it is closed and drained.
+    """
+    def __init__(self, send, interval=0.2):
+        self.send = send
+        self.interval = interval
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def watch(self, key, ring):
+        with self._lock:
+            self._watched[key] = [ring, 0]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="roon-stream-pusher", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                watched = list(self._watched.items())
+            for key, entry in watched:
+                ring, since = entry
+                data = ring.read(since)
+                entry[1] = data["next"]
+                if data["chunks"] or data["dropped"]:
+                    try:
+                        self.send(key, data)
+                    except Exception:
+                        pass
+                if data["closed"]:
+                    with self._lock:
+                        self._watched.pop(key, None)
@@ -0,0 +1,180 @@
+import sys
+import reprlib
+import itertools
+
+# (predicate, summarizer) pairs, most recently registered first
+_summarizers = []
+
+_repr = reprlib.Repr()
+_repr.maxstring = 200
+_repr.maxother = 200
+
+def register_summarizer(match, func=None):
+    """
+    Add a summarizer for values matching a type (or tuple of types) or a predicate.
+
+    Can be used as a decorator. The summarizer is called as
+    func(value, preview, max_items, stats) and fills in the preview dict,
+    which already holds "type"; later registrations take precedence.
+    """
+    if isinstance(match, (type, tuple)):
+        types = match
+        match = lambda value: isinstance(value, types)
+
+    def register(func):
+        _summarizers.insert(0, (match, func))
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+def type_name(value):
+    cls = type(value)
+    if cls.__module__ == "builtins":
+        return cls.__qualname__
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+def summarize(value, max_items=10, stats=False):
+    """
+    Bounded, JSON-serializable preview of a value.
+
+    Args:
+        value: Any Python object (node output, namespace variable)
+        max_items (int): Elements shown from the head and tail of sequences and arrays
+        stats (bool): Also compute min/max/mean where supported; this touches every
+                      element, so it is only done on request
+
+    Returns:
+        dict: At least {"type"}; arrays add shape, dtype, nbytes, head and tail
+    """
+    preview = {"type": type_name(value)}
+    for match, func in _summarizers:
+        try:
+            matched = match(value)
+        except Exception:
+            matched = False
+        if matched:
+            try:
+                func(value, preview, max_items, stats)
+                return preview
+            except Exception as e:
+                preview["summary_error"] = str(e)
+                break
+    preview["repr"] = _repr.repr(value)
+    return preview
+
+def _plain(items):
+    """Small Python values from an array head/tail, converted for JSON."""
+    plain = []
+    for item in items:
+        if hasattr(item, "item"):
+            item = item.item()
+        # complex, datetime, bytes and object elements are shown by their repr
+        plain.append(item if isinstance(item, (bool, int, float, str, type(None))) else _repr.repr(item))
+    return plain
+
+@register_summarizer((bool, int, float, complex, type(None)))
+def _summarize_scalar(value, preview, max_items, stats):
+    preview["value"] = value if not isinstance(value, complex) else repr(value)
+
+@register_summarizer((str, bytes, bytearray))
+def _summarize_text(value, preview, max_items, stats):
+    preview["length"] = len(value)
+    head = value[:max_items * 20]
+    preview["head"] = head if isinstance(head, str) else repr(head)
+    preview["truncated"] = len(value) > len(head)
+
+@register_summarizer((list, tuple, set, frozenset))
+def _summarize_sequence(value, preview, max_items, stats):
+    preview["length"] = len(value)
+    # sets cannot be sliced; take the first elements without copying the whole set
+    items = value if isinstance(value, (list, tuple)) else list(itertools.islice(value, 2 * max_items))
+    preview["head"] = [_repr.repr(item) for item in items[:max_items]]
+    if len(value) > 2 * max_items:
+        preview["tail"] = [_repr.repr(item) for item in items[-max_items:]]
+    elif len(value) > max_items:
+        preview["head"] = [_repr.repr(item) for item in items]
+    preview["nbytes"] = sys.getsizeof(value)
+
+@register_summarizer(dict)
+def _summarize_dict(value, preview, max_items, stats):
+    preview["length"] = len(value)
+    items = {}
+    for key, item in itertools.islice(value.items(), max_items):
+        if isinstance(item, dict):
+            # one level only, nested dicts could be arbitrarily deep (or cyclic)
+            items[str(key)] = {"type": type_name(item), "length": len(item)}
+        else:
+            items[str(key)] = summarize(item, max_items=3)
+    preview["items"] = items
+    preview["truncated"] = len(value) > max_items
+
+def _is_ndarray(value):
+    return hasattr(value, "__array_interface__") and hasattr(value, "shape") and hasattr(value, "dtype")
+
+@register_summarizer(_is_ndarray)
+def _summarize_ndarray(value, preview, max_items, stats):
+    preview["shape"] = list(value.shape)
+    preview["dtype"] = str(value.dtype)
+    preview["nbytes"] = int(value.nbytes)
+    size = int(value.size)
+    preview["size"] = size
+    # .flat slices copy only the requested elements, also for non-contiguous views
+    preview["head"] = _plain(value.flat[:max_items].tolist())
+    if size > max_items:
+        preview["tail"] = _plain(value.flat[max(max_items, size - max_items):].tolist())
+    if stats and size and value.dtype.kind in "biuf":
+        import numpy as np
+        preview["stats"] = {
+            "min": float(np.min(value)),
+            "max": float(np.max(value)),
+            "mean": float(np.mean(value)),
+        }
+
+def _is_awkward(value):
+    return type(value).__module__.startswith("awkward") and hasattr(value, "layout")
+
+@register_summarizer(_is_awkward)
+def _summarize_awkward(value, preview, max_items, stats):
+    import awkward as ak
+    preview["length"] = len(value)
+    preview["layout_type"] = _repr.repr(str(value.type))
+    preview["nbytes"] = int(value.nbytes)
+    preview["head"] = [_repr.repr(item) for item in value[:max_items].tolist()]
+    if len(value) > max_items:
+        preview["tail"] = [_repr.repr(item) for item in value[-max_items:].tolist()]
+    if stats:
+        try:
+            flat = ak.ravel(value)
+            preview["stats"] = {
+                "min": float(ak.min(flat)),
+                "max": float(ak.max(flat)),
+                "mean": float(ak.mean(flat)),
+            }
+        except Exception:
+            # records, strings and other non-numeric layouts have no stats
+            pass
+
+def _is_uproot_tree(value):
+    return type(value).__module__.startswith("uproot") and hasattr(value, "num_entries")
+
+@register_summarizer(_is_uproot_tree)
+def _summarize_uproot_tree(value, preview, max_items, stats):
+    preview["name"] = value.name
+    preview["num_entries"] = int(value.num_entries)
+    branches = value.keys()
+    preview["num_branches"] = len(branches)
+    preview["branches"] = list(branches[:max_items])
+    preview["truncated"] = len(branches) > max_items
+
+def _is_uproot_directory(value):
+    return type(value).__module__.startswith("uproot") and hasattr(value, "classnames")
+
+@register_summarizer(_is_uproot_directory)
+def _summarize_uproot_directory(value, preview, max_items, stats):
+    preview["path"] = getattr(value, "file_path", None) or getattr(getattr(value, "file", None), "file_path", None)
+    classnames = value.classnames()
+    preview["num_keys"] = len(classnames)
+    preview["keys"] = dict(itertools.islice(classnames.items(), max_items))
+    preview["truncated"] = len(classnames) > max_items
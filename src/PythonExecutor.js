@@ -5,6 +5,7 @@ class PythonExecutor {
       this.backend = backend === 'auto' ? this.detectBackend() : backend;
       this.pyodide = null; // Will be set if Pyodide is used
       this.initializeBackend();
+      this.installStreamTarget();
     }
 
     stdoutHandler = null;
@@ -107,6 +108,81 @@ ${code}
       return response.result; // Assumes PyWebView API returns { result, output }
     }
   
+    // Graph execution as a background job (Api.submit_graph): the compiled plan
+    // and per-node result cache are reused, so only nodes whose inputs changed
+    // run again, and output reaches the handlers while the graph is running
+    async executeGraph(graphData, maxWorkers = 1) {
+      if (this.backend !== 'pywebview') {
+        throw new Error(`Graph execution is not supported by backend: ${this.backend}`);
+      }
+      return await this.runJob(() => window.pywebview.api.submit_graph(graphData, maxWorkers));
+    }
+
+    // Background jobs started through the bridge, job id -> last chunk seq seen
+    jobs = {};
+    // output pushed before runJob knew the job id
+    unclaimed = {};
+
+    // Target of the output the app pushes while a job runs (roon.streaming.Pusher)
+    installStreamTarget() {
+      if (typeof window !== 'undefined') {
+        window.roonStream = (jobId, data) => this.receiveJobOutput(jobId, data);
+      }
+    }
+
+    receiveJobOutput(jobId, data) {
+      const job = this.jobs[jobId];
+      if (!data) {
+        return;
+      }
+      if (!job) {
+        (this.unclaimed[jobId] = this.unclaimed[jobId] || []).push(data);
+        return;
+      }
+      if (data.dropped && this.stderrHandler) {
+        this.stderrHandler(`[... ${data.dropped} output chunks dropped ...]`);
+      }
+      for (const chunk of data.chunks) {
+        // pushed and polled output can overlap
+        if (chunk.seq <= job.seq) {
+          continue;
+        }
+        job.seq = chunk.seq;
+        if (chunk.stream === 'stdout' && this.stdoutHandler) {
+          this.stdoutHandler(chunk.text);
+        } else if (chunk.stream === 'stderr' && this.stderrHandler) {
+          this.stderrHandler(chunk.text);
+        } else if (chunk.stream === 'event') {
+          console.debug('Job event:', jobId, chunk.event);
+        }
+      }
+    }
+
+    // Submit a job, stream its output until it finishes and return its status
+    // ({job_id, state, error, result, ...}, see Api.job_result)
+    async runJob(submit) {
+      const { job_id } = await submit();
+      this.jobs[job_id] = { seq: 0 };
+      for (const data of this.unclaimed[job_id] || []) {
+        this.receiveJobOutput(job_id, data);
+      }
+      delete this.unclaimed[job_id];
+      try {
+        let status = await window.pywebview.api.job_result(job_id, 0.5);
+        while (status.state === 'pending' || status.state === 'running') {
+          status = await window.pywebview.api.job_result(job_id, 0.5);
+        }
+        // output written after the last push
+        this.receiveJobOutput(job_id, await window.pywebview.api.job_output(job_id, this.jobs[job_id].seq));
+        if (status.state !== 'done' && this.stderrHandler) {
+          this.stderrHandler(`Job ${job_id} ${status.state}${status.error ? ': ' + status.error : ''}`);
+        }
+        return status;
+      } finally {
+        delete this.jobs[job_id];
+      }
+    }
+
     // Jupyter Kernel Gateway execution (placeholder)
     async executeJupyter(code, globals, locals) {
       // Placeholder: Requires WebSocket setup to a Jupyter Kernel Gateway
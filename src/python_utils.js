@@ -68,6 +68,20 @@ result = defs
 export async function runEngine( graphData, execute = true ) {
     console.log("Running Engine...");
     let output = null;
+
+    if (execute && executor.backend === 'pywebview') {
+        if (config.filename) {
+            // the exported script is still written on every run
+            await executor.execute( pythonEngineCode, {graphData: graphData, filename: config.filename}, {} );
+        }
+        // run the graph in-process as a background job: the compiled plan and
+        // result cache are reused between runs, so only nodes whose inputs
+        // changed execute again, and their output is streamed while it runs
+        let status = await executor.executeGraph( graphData );
+        console.log("Graph run complete:", status);
+        return null;
+    }
+
     try{
         output = await executor.execute( pythonEngineCode, {graphData: graphData, filename: config.filename}, {} );
     } catch (err) {
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from roon import engine, jobs
+
+SPIN_SOURCE = """def spin(seconds):
+    import time
+    end = time.time() + seconds
+    while time.time() < end:
+        time.sleep(0.01)
+    return seconds"""
+
+def spin_graph(count, seconds):
+    nodes = [
+        {
+            "id": node_id,
+            "name": "spin",
+            "module": "<source>",
+            "source": SPIN_SOURCE,
+            "inputs": [{"name": "seconds", "type": "float", "default": seconds, "kind": "POSITIONAL_OR_KEYWORD"}],
+            "outputs": [{"name": "return_value", "type": "float"}],
+        }
+        for node_id in range(1, count + 1)
+    ]
+    return {"nodes": nodes, "connections": []}
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+def node_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("roon-node")]
+
+def test_cancel_parallel_graph_job():
+    manager = jobs.JobManager()
+    graph = spin_graph(4, 30.0)
+    job_id = manager.submit(engine.execute_graph, graph, namespace={}, max_workers=2)
+    assert wait_for(lambda: len(node_threads()) == 2)
+
+    assert manager.cancel(job_id)
+    status = manager.result(job_id, timeout=5)
+    assert status["state"] == jobs.CANCELLED
+    # the running nodes are interrupted too, nothing keeps the interpreter alive
+    assert wait_for(lambda: not node_threads())
+
+def test_parallel_graph_job_finishes():
+    manager = jobs.JobManager()
+    job_id = manager.submit(engine.execute_graph, spin_graph(3, 0.05), namespace={}, max_workers=2)
+    status = manager.result(job_id, timeout=5)
+    assert status["state"] == jobs.DONE
+    assert status["result"]["results"] == {1: 0.05, 2: 0.05, 3: 0.05}